@@ -5,7 +5,7 @@ Provides database operations for User, Role, Permission, etc.
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select, bindparam
 from uuid import UUID
 
 from api.core import models, schemas
@@ -13,10 +13,25 @@ from api.core.security import (
     get_password_hash,
     verify_password,
     field_encryption,
+    hash_token,
     MFAManager
 )
 
 
+# Statements for hot lookups, built once so SQLAlchemy's compiled cache
+# is hit without rebuilding the expression tree on every call
+SELECT_USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+SELECT_USER_BY_USERNAME = select(models.User).where(models.User.username == bindparam("username"))
+SELECT_USER_BY_RESET_TOKEN = select(models.User).where(models.User.reset_token == bindparam("token"))
+SELECT_SESSION_BY_ACCESS_TOKEN = select(models.Session).where(
+    models.Session.access_token_hash == bindparam("token_hash")
+)
+SELECT_SESSION_BY_REFRESH_TOKEN = select(models.Session).where(
+    models.Session.refresh_token_hash == bindparam("token_hash")
+)
+SELECT_API_KEY_BY_ID = select(models.APIKey).where(models.APIKey.id == bindparam("key_id"))
+
+
 # User CRUD
 class UserCRUD:
     """CRUD operations for User model."""
@@ -29,12 +44,17 @@ class UserCRUD:
     @staticmethod
     def get_by_email(db: Session, email: str) -> Optional[models.User]:
         """Get user by email."""
-        return db.query(models.User).filter(models.User.email == email).first()
+        return db.execute(SELECT_USER_BY_EMAIL, {"email": email}).scalars().first()
     
     @staticmethod
     def get_by_username(db: Session, username: str) -> Optional[models.User]:
         """Get user by username."""
-        return db.query(models.User).filter(models.User.username == username).first()
+        return db.execute(SELECT_USER_BY_USERNAME, {"username": username}).scalars().first()
+    
+    @staticmethod
+    def get_by_reset_token(db: Session, token: str) -> Optional[models.User]:
+        """Get user by password reset token."""
+        return db.execute(SELECT_USER_BY_RESET_TOKEN, {"token": token}).scalars().first()
     
     @staticmethod
     def get_multi(
@@ -50,9 +70,14 @@ class UserCRUD:
         return query.offset(skip).limit(limit).all()
     
     @staticmethod
-    def create(db: Session, user_create: schemas.UserCreate) -> models.User:
+    def create(
+        db: Session,
+        user_create: schemas.UserCreate,
+        hashed_password: Optional[str] = None
+    ) -> models.User:
         """Create a new user."""
-        hashed_password = get_password_hash(user_create.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_create.password)
         
         db_user = models.User(
             email=user_create.email,
@@ -87,10 +112,13 @@ class UserCRUD:
     def update_password(
         db: Session,
         user: models.User,
-        new_password: str
+        new_password: str,
+        hashed_password: Optional[str] = None
     ) -> models.User:
         """Update user password."""
-        user.hashed_password = get_password_hash(new_password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(new_password)
+        user.hashed_password = hashed_password
         user.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(user)
@@ -113,19 +141,23 @@ class UserCRUD:
     @staticmethod
     def add_role(db: Session, user: models.User, role: models.Role) -> models.User:
         """Add a role to a user."""
+        from api.core.dependencies import clear_permission_cache  # avoids a circular import
         if role not in user.roles:
             user.roles.append(role)
             db.commit()
             db.refresh(user)
+            clear_permission_cache(user.id)
         return user
     
     @staticmethod
     def remove_role(db: Session, user: models.User, role: models.Role) -> models.User:
         """Remove a role from a user."""
+        from api.core.dependencies import clear_permission_cache  # avoids a circular import
         if role in user.roles:
             user.roles.remove(role)
             db.commit()
             db.refresh(user)
+            clear_permission_cache(user.id)
         return user
 
 
@@ -262,8 +294,8 @@ class SessionCRUD:
         """Create a new session."""
         db_session = models.Session(
             user_id=user_id,
-            access_token=access_token,
-            refresh_token=refresh_token,
+            access_token_hash=hash_token(access_token),
+            refresh_token_hash=hash_token(refresh_token),
             expires_at=expires_at,
             ip_address=ip_address,
             user_agent=user_agent,
@@ -277,16 +309,16 @@ class SessionCRUD:
     @staticmethod
     def get_by_access_token(db: Session, access_token: str) -> Optional[models.Session]:
         """Get session by access token."""
-        return db.query(models.Session).filter(
-            models.Session.access_token == access_token
-        ).first()
+        return db.execute(
+            SELECT_SESSION_BY_ACCESS_TOKEN, {"token_hash": hash_token(access_token)}
+        ).scalars().first()
     
     @staticmethod
     def get_by_refresh_token(db: Session, refresh_token: str) -> Optional[models.Session]:
         """Get session by refresh token."""
-        return db.query(models.Session).filter(
-            models.Session.refresh_token == refresh_token
-        ).first()
+        return db.execute(
+            SELECT_SESSION_BY_REFRESH_TOKEN, {"token_hash": hash_token(refresh_token)}
+        ).scalars().first()
     
     @staticmethod
     def get_user_sessions(
@@ -314,6 +346,15 @@ class SessionCRUD:
     ) -> List[models.Session]:
         """Get all active sessions for a user."""
         return SessionCRUD.get_user_sessions(db, user_id, active_only=True)
+
+    @staticmethod
+    def count_active_user_sessions(db: Session, user_id: UUID) -> int:
+        """Count active sessions for a user without loading them."""
+        return db.query(func.count(models.Session.id)).filter(
+            models.Session.user_id == user_id,
+            models.Session.is_active == True,
+            models.Session.expires_at > datetime.utcnow()
+        ).scalar() or 0
     
     @staticmethod
     def update_activity(db: Session, session: models.Session) -> models.Session:
@@ -334,13 +375,14 @@ class SessionCRUD:
     
     @staticmethod
     def revoke_all_user_sessions(db: Session, user_id: UUID) -> None:
-        """Revoke all sessions for a user."""
+        """Revoke all sessions for a user in a single UPDATE."""
         db.query(models.Session).filter(
-            models.Session.user_id == user_id
+            models.Session.user_id == user_id,
+            models.Session.is_active == True
         ).update({
             "is_active": False,
             "revoked_at": datetime.utcnow()
-        })
+        }, synchronize_session=False)
         db.commit()
 
 
@@ -378,6 +420,11 @@ class APIKeyCRUD:
         db.refresh(db_api_key)
         return db_api_key
     
+    @staticmethod
+    def get_by_id(db: Session, key_id: UUID) -> Optional[models.APIKey]:
+        """Get API key by ID."""
+        return db.execute(SELECT_API_KEY_BY_ID, {"key_id": key_id}).scalars().first()
+    
     @staticmethod
     def get_by_prefix(db: Session, prefix: str) -> Optional[models.APIKey]:
         """Get API key by prefix."""
@@ -2,7 +2,8 @@
 FastAPI dependencies for authentication and authorization.
 Provides dependency injection for current user, permissions, etc.
 """
-from typing import Optional, List
+from typing import Any, Optional, List
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from jose import JWTError
@@ -20,6 +21,38 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 # API Key header scheme
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Permission check results keyed by (user_id, permission); short-lived so
+# role changes take effect within the TTL
+_permission_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def user_has_permission(user: models.User, permission: str) -> bool:
+    """
+    Check a user permission, caching the result briefly.
+    
+    Args:
+        user: User to check
+        permission: Permission name
+        
+    Returns:
+        True if the user has the permission through their roles
+    """
+    key = (user.id, permission)
+    result = _permission_cache.get(key)
+    if result is None:
+        result = user.has_permission(permission)
+        _permission_cache[key] = result
+    return result
+
+
+def clear_permission_cache(user_id: Any = None) -> None:
+    """Drop cached permission results for one user, or for everyone."""
+    if user_id is None:
+        _permission_cache.clear()
+        return
+    for key in [key for key in list(_permission_cache) if key[0] == user_id]:
+        _permission_cache.pop(key, None)
+
 
 async def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
@@ -215,7 +248,7 @@ class PermissionChecker:
             HTTPException: If user doesn't have required permissions
         """
         for permission in self.required_permissions:
-            if not current_user.has_permission(permission):
+            if not user_has_permission(current_user, permission):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Missing permission: {permission}"
@@ -0,0 +1,42 @@
+"""
+In-process Bloom filter of registered emails and usernames.
+Lets registration skip the uniqueness SELECTs when a value has never been seen.
+"""
+from pybloom_live import ScalableBloomFilter
+from sqlalchemy.orm import Session
+
+from api.core import models
+
+
+class IdentityFilter:
+    """Probabilistic set of known emails and usernames."""
+
+    def __init__(self):
+        self._emails = ScalableBloomFilter(mode=ScalableBloomFilter.SMALL_SET_GROWTH)
+        self._usernames = ScalableBloomFilter(mode=ScalableBloomFilter.SMALL_SET_GROWTH)
+        self.loaded = False
+
+    def load(self, db: Session) -> None:
+        """Populate the filter from the users table."""
+        rows = db.query(models.User.email, models.User.username).yield_per(1000)
+        for email, username in rows:
+            self.add(email, username)
+        self.loaded = True
+
+    def add(self, email: str, username: str | None = None) -> None:
+        """Record a registered email and optional username."""
+        self._emails.add(email)
+        if username:
+            self._usernames.add(username)
+
+    def may_contain_email(self, email: str) -> bool:
+        """Return False only if the email is definitely not registered."""
+        return not self.loaded or email in self._emails
+
+    def may_contain_username(self, username: str) -> bool:
+        """Return False only if the username is definitely not taken."""
+        return not self.loaded or username in self._usernames
+
+
+# Global filter instance, loaded on application startup
+identity_filter = IdentityFilter()
@@ -9,7 +9,7 @@ import uuid
 
 from sqlalchemy import (
     Boolean, Column, Integer, String, DateTime, Text, 
-    ForeignKey, Table, JSON, Enum as SQLEnum, Index
+    ForeignKey, Table, JSON, Enum as SQLEnum, Index, LargeBinary
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -192,9 +192,9 @@ class Session(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     
-    # Token information
-    access_token = Column(String(500), unique=True, nullable=False, index=True)
-    refresh_token = Column(String(500), unique=True, nullable=False, index=True)
+    # Token information: only SHA-256 digests are stored, used for lookups
+    access_token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
+    refresh_token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     
     # Session metadata
     ip_address = Column(String(45), nullable=True)  # IPv6 compatible
@@ -213,6 +213,10 @@ class Session(Base):
     # Relationships
     user = relationship("User", back_populates="sessions")
     
+    __table_args__ = (
+        Index('ix_sessions_user_active', 'user_id', 'is_active'),
+    )
+    
     def __repr__(self):
         return f"<Session {self.id} for user {self.user_id}>"
     
@@ -2,22 +2,41 @@
 Enhanced authentication routes with MFA support.
 Handles login, registration, token refresh, MFA setup/verification, and API keys.
 """
+import hmac
+import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from api.database import get_db
-from api.core import models, schemas, crud
+from api.core import models, schemas, crud, storage
+from api.core import email as email_utils
+from api.core.identity_filter import identity_filter
 from api.core.security import (
-    verify_password,
+    averify_dummy_password,
+    averify_password,
+    aget_password_hash,
     create_access_token,
     create_refresh_token,
     decode_token,
     verify_token_type,
-    MFAManager,
+    generate_secret as generate_mfa_secret,
+    get_totp_uri,
+    generate_qr_code,
+    verify_totp,
+    verify_user_totp,
+    consume_totp,
+    generate_backup_codes,
     field_encryption,
-    generate_api_key
+    generate_api_key,
+    generate_reset_token,
+    hash_token
 )
 from api.core.dependencies import (
     get_current_user,
@@ -26,10 +45,20 @@ from api.core.dependencies import (
     get_user_agent
 )
 from api.config import settings
+from api.modules.tasks import models as task_models
 
 
+logger = logging.getLogger("uvicorn.error")
+
+# Token lifetimes are fixed by settings, so build them once
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRES = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+ACCESS_TOKEN_EXPIRES_IN = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
 router = APIRouter()
-mfa_manager = MFAManager()
+
+# Validators for list responses, built once at import
+API_KEY_LIST_ADAPTER = TypeAdapter(List[schemas.APIKeyResponse])
 
 
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
@@ -46,16 +75,17 @@ async def register(
     - **username**: Optional username
     - **full_name**: Optional full name
     """
-    # Check if email already exists
-    existing_user = crud.user_crud.get_by_email(db, email=user_create.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
+    # Check if email already exists (only hits the DB on a filter match)
+    if identity_filter.may_contain_email(user_create.email):
+        existing_user = crud.user_crud.get_by_email(db, email=user_create.email)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
     
     # Check if username already exists
-    if user_create.username:
+    if user_create.username and identity_filter.may_contain_username(user_create.username):
         existing_username = crud.user_crud.get_by_username(db, username=user_create.username)
         if existing_username:
             raise HTTPException(
@@ -63,8 +93,18 @@ async def register(
                 detail="Username already taken"
             )
     
-    # Create user
-    user = crud.user_crud.create(db, user_create)
+    # Create user (unique constraints catch users registered by other workers)
+    try:
+        hashed_password = await aget_password_hash(user_create.password)
+        user = crud.user_crud.create(db, user_create, hashed_password=hashed_password)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered"
+        )
+    identity_filter.add(user.email, user.username)
+    user_response = schemas.orm_to_json(user, schemas.UserResponse)
     
     # Assign default "user" role
     user_role = crud.role_crud.get_by_name(db, "user")
@@ -83,7 +123,7 @@ async def register(
         user_agent=get_user_agent(request) if request else None,
     )
     
-    return user
+    return ORJSONResponse(user_response, status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=schemas.LoginResponse)
@@ -102,12 +142,16 @@ async def login(
     # Get user
     user = crud.user_crud.get_by_email(db, email=login_request.email)
     
-    import logging
-    logger = logging.getLogger("uvicorn.error")
     logger.info(f"LOGIN ATTEMPT: {login_request.email} | MFA Code present: {bool(login_request.mfa_code)}")
     
-    # Verify password
-    if not user or not verify_password(login_request.password, user.hashed_password):
+    # Verify password (always run the KDF so unknown emails aren't faster)
+    if user:
+        password_valid = await averify_password(login_request.password, user.hashed_password)
+    else:
+        await averify_dummy_password(login_request.password)
+        password_valid = False
+    
+    if not password_valid:
         logger.info("LOGIN FAILED: Invalid password")
         # Log failed login
         crud.audit_log_crud.create(
@@ -138,20 +182,19 @@ async def login(
     # Check MFA
     if user.mfa_enabled:
         if not login_request.mfa_code:
-            return schemas.LoginResponse(
-                user=schemas.UserResponse.model_validate(user),
-                token=schemas.Token(
-                    access_token="",
-                    refresh_token="",
-                    token_type="bearer",
-                    expires_in=0
-                ),
-                requires_mfa=True
-            )
+            return ORJSONResponse({
+                "user": schemas.orm_to_json(user, schemas.UserResponse),
+                "token": {
+                    "access_token": "",
+                    "refresh_token": "",
+                    "token_type": "bearer",
+                    "expires_in": 0,
+                },
+                "requires_mfa": True,
+            })
         
         # Verify MFA code
-        decrypted_secret = field_encryption.decrypt(user.mfa_secret)
-        if not mfa_manager.verify_totp(decrypted_secret, login_request.mfa_code):
+        if not verify_user_totp(user.id, user.mfa_secret, login_request.mfa_code):
             # Check backup codes
             # TODO: Implement backup code verification
             raise HTTPException(
@@ -160,20 +203,18 @@ async def login(
             )
     
     # Create tokens
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email},
-        expires_delta=access_token_expires
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
     
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token = create_refresh_token(
         data={"sub": user.email},
-        expires_delta=refresh_token_expires
+        expires_delta=REFRESH_TOKEN_EXPIRES
     )
     
     # Create session
-    session_expires = datetime.utcnow() + refresh_token_expires
+    session_expires = datetime.utcnow() + REFRESH_TOKEN_EXPIRES
     crud.session_crud.create(
         db,
         user_id=user.id,
@@ -184,6 +225,10 @@ async def login(
         user_agent=get_user_agent(request) if request else None,
     )
     
+    # A verified MFA code is single use once a session exists
+    if login_request.mfa_code:
+        consume_totp(user.id, login_request.mfa_code)
+    
     # Update last login
     crud.user_crud.update_last_login(db, user)
     
@@ -197,16 +242,17 @@ async def login(
         user_agent=get_user_agent(request) if request else None,
     )
     
-    return schemas.LoginResponse(
-        user=schemas.UserResponse.model_validate(user),
-        token=schemas.Token(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-        ),
-        requires_mfa=False
-    )
+    # Built as a plain body so response_model does not re-validate it
+    return ORJSONResponse({
+        "user": schemas.orm_to_json(user, schemas.UserResponse),
+        "token": {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRES_IN,
+        },
+        "requires_mfa": False,
+    })
 
 
 @router.post("/refresh", response_model=schemas.Token)
@@ -248,14 +294,13 @@ async def refresh_token(
             raise credentials_exception
         
         # Create new tokens
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         new_access_token = create_access_token(
             data={"sub": user.email},
-            expires_delta=access_token_expires
+            expires_delta=ACCESS_TOKEN_EXPIRES
         )
         
         # Update session with new access token
-        session.access_token = new_access_token
+        session.access_token_hash = hash_token(new_access_token)
         session.last_activity_at = datetime.utcnow()
         db.commit()
         
@@ -263,7 +308,7 @@ async def refresh_token(
             access_token=new_access_token,
             refresh_token=token_refresh.refresh_token,
             token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=ACCESS_TOKEN_EXPIRES_IN
         )
         
     except Exception as e:
@@ -299,16 +344,12 @@ async def request_password_reset(
     db: Session = Depends(get_db)
 ):
     """Request password reset. Always returns success to prevent user enumeration."""
-    import secrets
-    from datetime import datetime, timedelta
-    from api.core import email as email_utils
-    
     # Find user by email
     user = crud.user_crud.get_by_email(db, request_data.email)
     
     if user:
         # Generate reset token
-        reset_token = secrets.token_urlsafe(32)
+        reset_token = generate_reset_token()
         
         # Set token and expiration (1 hour from now)
         user.reset_token = reset_token
@@ -336,12 +377,8 @@ async def validate_reset_token(
     db: Session = Depends(get_db)
 ):
     """Validate password reset token."""
-    from datetime import datetime
-    
     # Find user with this token
-    user = db.query(models.User).filter(
-        models.User.reset_token == token
-    ).first()
+    user = crud.user_crud.get_by_reset_token(db, token)
     
     if not user:
         raise HTTPException(
@@ -365,13 +402,8 @@ async def confirm_password_reset(
     db: Session = Depends(get_db)
 ):
     """Confirm password reset with token and new password."""
-    from datetime import datetime
-    from api.core import email as email_utils
-    
     # Find user with this token
-    user = db.query(models.User).filter(
-        models.User.reset_token == reset_data.token
-    ).first()
+    user = crud.user_crud.get_by_reset_token(db, reset_data.token)
     
     if not user:
         raise HTTPException(
@@ -387,7 +419,10 @@ async def confirm_password_reset(
         )
     
     # Update password
-    crud.user_crud.update_password(db, user, reset_data.new_password)
+    hashed_password = await aget_password_hash(reset_data.new_password)
+    crud.user_crud.update_password(
+        db, user, reset_data.new_password, hashed_password=hashed_password
+    )
     
     # Clear reset token
     user.reset_token = None
@@ -435,7 +470,7 @@ async def update_current_user(
         description="User profile updated",
     )
     
-    return updated_user
+    return ORJSONResponse(schemas.orm_to_json(updated_user, schemas.UserResponse))
 
 
 @router.get("/me/stats")
@@ -444,20 +479,16 @@ async def get_user_statistics(
     db: Session = Depends(get_db)
 ):
     """Get user statistics including account age, task count, and session info."""
-    from datetime import datetime
-    
     # Calculate account age in days
     account_age_days = (datetime.utcnow() - current_user.created_at).days
     
     # Get total tasks count
-    from api.modules.tasks import models as task_models
     total_tasks = db.query(task_models.Task).filter(
         task_models.Task.user_id == current_user.id
     ).count()
     
     # Get active sessions count
-    active_sessions = crud.session_crud.get_active_user_sessions(db, current_user.id)
-    active_sessions_count = len(active_sessions) if active_sessions else 0
+    active_sessions_count = crud.session_crud.count_active_user_sessions(db, current_user.id)
     
     return {
         "account_age_days": account_age_days,
@@ -478,15 +509,17 @@ async def get_user_sessions(
     sessions = crud.session_crud.get_active_user_sessions(db, current_user.id)
     
     # Get current request's session token to mark current session
-    current_token = None
+    current_token_hash = None
     if request and request.headers.get("Authorization"):
         auth_header = request.headers.get("Authorization")
         if auth_header.startswith("Bearer "):
-            current_token = auth_header[7:]
+            current_token_hash = hash_token(auth_header[7:])
     
     result = []
     for session in sessions:
-        is_current = session.access_token == current_token
+        is_current = current_token_hash is not None and hmac.compare_digest(
+            session.access_token_hash, current_token_hash
+        )
         result.append({
             "id": str(session.id),
             "device_info": session.user_agent or "Unknown",
@@ -506,8 +539,6 @@ async def revoke_session(
     db: Session = Depends(get_db)
 ):
     """Revoke a specific user session."""
-    from uuid import UUID
-    
     # Convert session_id to UUID
     try:
         session_uuid = UUID(session_id)
@@ -550,14 +581,12 @@ async def upload_avatar(
     db: Session = Depends(get_db)
 ):
     """Upload user avatar image."""
-    from api.core.storage import upload_avatar as upload_avatar_file, delete_avatar
-    
     # Delete old avatar if exists
     if current_user.avatar_url:
-        delete_avatar(current_user.avatar_url)
+        await storage.delete_avatar(current_user.avatar_url)
     
     # Upload new avatar
-    avatar_url = await upload_avatar_file(file, str(current_user.id))
+    avatar_url = await storage.upload_avatar(file, str(current_user.id))
     
     # Update user record
     current_user.avatar_url = avatar_url
@@ -583,8 +612,6 @@ async def delete_user_avatar(
     db: Session = Depends(get_db)
 ):
     """Delete user avatar."""
-    from api.core.storage import delete_avatar
-    
     if not current_user.avatar_url:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -592,7 +619,7 @@ async def delete_user_avatar(
         )
     
     # Delete from storage
-    delete_avatar(current_user.avatar_url)
+    await storage.delete_avatar(current_user.avatar_url)
     
     # Remove from user record
     current_user.avatar_url = None
@@ -608,21 +635,19 @@ async def upload_banner(
     db: Session = Depends(get_db)
 ):
     """Upload user profile banner."""
-    from api.core.storage import upload_banner as upload_banner_file, delete_banner
-    
     # Delete existing banner if any
     if current_user.banner_url:
-        delete_banner(current_user.banner_url)
+        await storage.delete_banner(current_user.banner_url)
     
     # Upload new banner
-    banner_url = await upload_banner_file(file, str(current_user.id))
+    banner_url = await storage.upload_banner(file, str(current_user.id))
     
     # Update user
     current_user.banner_url = banner_url
     db.commit()
     db.refresh(current_user)
     
-    return current_user
+    return ORJSONResponse(schemas.orm_to_json(current_user, schemas.UserResponse))
 
 
 @router.delete("/me/banner", status_code=status.HTTP_204_NO_CONTENT)
@@ -631,38 +656,14 @@ async def delete_banner(
     db: Session = Depends(get_db)
 ):
     """Delete user profile banner."""
-    from api.core.storage import delete_banner
-    
     if current_user.banner_url:
-        delete_banner(current_user.banner_url)
+        await storage.delete_banner(current_user.banner_url)
         
         current_user.banner_url = None
         db.add(current_user)
         db.commit()
 
 
-@router.put("/me", response_model=schemas.UserResponse)
-async def update_current_user(
-    user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Update current user information."""
-    updated_user = crud.user_crud.update(db, current_user, user_update)
-    
-    # Log update
-    crud.audit_log_crud.create(
-        db,
-        user_id=current_user.id,
-        action=models.AuditAction.UPDATE,
-        resource_type="user",
-        resource_id=str(current_user.id),
-        description="User profile updated",
-    )
-    
-    return updated_user
-
-
 @router.put("/me/password")
 async def update_password(
     password_update: schemas.UserPasswordUpdate,
@@ -672,14 +673,17 @@ async def update_password(
 ):
     """Update current user password."""
     # Verify current password
-    if not verify_password(password_update.current_password, current_user.hashed_password):
+    if not await averify_password(password_update.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    crud.user_crud.update_password(db, current_user, password_update.new_password)
+    hashed_password = await aget_password_hash(password_update.new_password)
+    crud.user_crud.update_password(
+        db, current_user, password_update.new_password, hashed_password=hashed_password
+    )
     
     # Revoke all sessions (force re-login)
     crud.session_crud.revoke_all_user_sessions(db, current_user.id)
@@ -712,14 +716,14 @@ async def setup_mfa(
         )
     
     # Generate secret
-    secret = mfa_manager.generate_secret()
+    secret = generate_mfa_secret()
     
-    # Generate QR code
-    uri = mfa_manager.get_totp_uri(secret, current_user.email)
-    qr_code = mfa_manager.generate_qr_code(uri)
+    # Generate QR code (PNG rendering is CPU-bound, keep it off the event loop)
+    uri = get_totp_uri(secret, current_user.email)
+    qr_code = await run_in_threadpool(generate_qr_code, uri)
     
     # Generate backup codes
-    backup_codes = mfa_manager.generate_backup_codes(settings.MFA_BACKUP_CODES_COUNT)
+    backup_codes = generate_backup_codes(settings.MFA_BACKUP_CODES_COUNT)
     
     # Encrypt and save secret (but don't enable yet)
     encrypted_secret = field_encryption.encrypt(secret)
@@ -759,7 +763,7 @@ async def verify_mfa(
     decrypted_secret = field_encryption.decrypt(current_user.mfa_secret)
     
     # Verify code
-    if not mfa_manager.verify_totp(decrypted_secret, mfa_verify.code):
+    if not verify_totp(decrypted_secret, mfa_verify.code):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid MFA code"
@@ -797,7 +801,7 @@ async def disable_mfa(
         )
     
     # Verify password
-    if not verify_password(mfa_disable.password, current_user.hashed_password):
+    if not await averify_password(mfa_disable.password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
@@ -806,7 +810,7 @@ async def disable_mfa(
     # Verify MFA code if provided
     if mfa_disable.code:
         decrypted_secret = field_encryption.decrypt(current_user.mfa_secret)
-        if not mfa_manager.verify_totp(decrypted_secret, mfa_disable.code):
+        if not verify_totp(decrypted_secret, mfa_disable.code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid MFA code"
@@ -854,10 +858,10 @@ async def create_api_key(
     )
     
     # Return response with full key (only time it's shown)
-    response = schemas.APIKeyCreateResponse.model_validate(db_api_key)
-    response.key = key
-    
-    return response
+    return schemas.APIKeyCreateResponse.model_validate({
+        **schemas.to_dict(db_api_key, schemas.APIKeyResponse),
+        "key": key,
+    })
 
 
 @router.get("/api-keys", response_model=list[schemas.APIKeyResponse])
@@ -867,7 +871,10 @@ async def list_api_keys(
 ):
     """List all API keys for current user."""
     api_keys = crud.api_key_crud.get_user_keys(db, current_user.id)
-    return api_keys
+    # Validated once here; returning a response skips response_model re-validation
+    return ORJSONResponse(API_KEY_LIST_ADAPTER.dump_python(
+        API_KEY_LIST_ADAPTER.validate_python(api_keys, from_attributes=True), mode="json"
+    ))
 
 
 @router.delete("/api-keys/{key_id}")
@@ -877,8 +884,17 @@ async def delete_api_key(
     db: Session = Depends(get_db)
 ):
     """Delete an API key."""
+    # Convert key_id to UUID
+    try:
+        key_uuid = UUID(key_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid API key ID format"
+        )
+    
     # Get API key
-    api_key = db.query(models.APIKey).filter(models.APIKey.id == key_id).first()
+    api_key = crud.api_key_crud.get_by_id(db, key_uuid)
     
     if not api_key:
         raise HTTPException(
@@ -3,10 +3,13 @@ Pydantic schemas for core models.
 Used for request/response validation and serialization.
 """
 from datetime import datetime
-from typing import Optional, List
+from operator import attrgetter
+from typing import Any, Optional, List
 from pydantic import BaseModel, EmailStr, Field, UUID4, ConfigDict
 from enum import Enum
 
+from api.config import settings
+
 
 # Enums
 class UserRoleEnum(str, Enum):
@@ -43,6 +46,52 @@ class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Per-schema (field names, attrgetter) pairs for to_dict
+_attr_getters: dict[type[BaseModel], tuple[tuple[str, ...], attrgetter]] = {}
+
+
+def to_dict(obj: Any, schema: type[BaseModel]) -> dict[str, Any]:
+    """
+    Read a schema's fields off an ORM object into a dict.
+    
+    Uses one precompiled attrgetter per schema instead of a getattr per
+    field. Only suitable for schemas whose fields are plain columns.
+    """
+    entry = _attr_getters.get(schema)
+    if entry is None:
+        fields = tuple(schema.model_fields)
+        entry = _attr_getters[schema] = (fields, attrgetter(*fields))
+    fields, getter = entry
+    values = getter(obj)
+    if len(fields) == 1:
+        values = (values,)
+    return dict(zip(fields, values))
+
+
+def orm_to_response(obj: Any, schema: type[BaseModel]) -> BaseModel:
+    """
+    Build a response schema from an ORM object.
+    
+    Rows read back from our own database are trusted, so with
+    settings.TRUST_DB the per-field validators are skipped via
+    model_construct. Request input is always fully validated.
+    """
+    data = to_dict(obj, schema)
+    if settings.TRUST_DB:
+        return schema.model_construct(**data)
+    return schema.model_validate(data)
+
+
+def orm_to_json(obj: Any, schema: type[BaseModel]) -> dict:
+    """
+    Build a JSON-ready response body from an ORM object.
+    
+    Routes return this in an ORJSONResponse, which FastAPI sends as is;
+    returning the model instead would be re-validated by response_model.
+    """
+    return orm_to_response(obj, schema).model_dump(mode="json")
+
+
 # User schemas
 class UserBase(BaseSchema):
     """Base user schema."""
@@ -306,6 +355,35 @@ class PaginatedResponse(BaseModel):
     total_pages: int
 
 
-# Update forward references
-UserWithRoles.model_rebuild()
+def warm_schemas(*models: type[BaseModel]) -> None:
+    """
+    Materialize validators and serializers at import time so the first
+    request doesn't pay for core-schema construction.
+    
+    Disabled with SCHEMA_WARMUP=false (e.g. for fast test startup).
+    """
+    if not settings.SCHEMA_WARMUP:
+        return
+    for model in models:
+        model.__pydantic_validator__
+        model.__pydantic_serializer__
+
+
+# Update forward references (dependencies before dependents)
 RoleWithPermissions.model_rebuild()
+UserWithRoles.model_rebuild()
+
+warm_schemas(
+    UserResponse,
+    UserWithRoles,
+    RoleResponse,
+    RoleWithPermissions,
+    PermissionResponse,
+    Token,
+    LoginResponse,
+    MFASetupResponse,
+    APIKeyResponse,
+    APIKeyCreateResponse,
+    SessionResponse,
+    AuditLogResponse,
+)
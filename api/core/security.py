@@ -2,54 +2,106 @@
 Enhanced authentication utilities for Lexicon.
 Includes password hashing, JWT tokens, MFA (TOTP), and encryption.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Any
+import asyncio
 import secrets
 import base64
-import io
-
-from jose import jwt, JWTError
+import hashlib
+import hmac
+import os
+import sys
+import time
+
+from cachetools import TTLCache
+from jose import jwt, ExpiredSignatureError
 from passlib.context import CryptContext
-import pyotp
-import qrcode
-from cryptography.fernet import Fernet
 
 from api.config import settings
 
 
 # Password hashing context
 if settings.PASSWORD_HASH_SCHEME == "argon2":
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+    pwd_context = CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=settings.ARGON2_TIME_COST,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
 else:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Dedicated pool for password KDF work so it never runs on the event loop
+_pwd_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pwd-hash")
+
+
+@lru_cache(maxsize=1)
+def get_dummy_password_hash() -> str:
+    """
+    Get the hash of a random password, verified against when no user matches
+    a login so unknown emails cost the same KDF work as wrong passwords.
+    
+    Computed on first use rather than at import, so workers and scripts that
+    import this module never pay for a full KDF run.
+    """
+    return pwd_context.hash(secrets.token_urlsafe(16))
+
 
 # Encryption for sensitive fields
 class FieldEncryption:
-    """Field-level encryption for sensitive data."""
+    """Field-level encryption for sensitive data (AES-256-GCM)."""
+    
+    NONCE_SIZE = 12
     
     def __init__(self, key: Optional[str] = None):
         """Initialize with encryption key."""
         if key is None:
             key = settings.SECRET_KEY
-        # Ensure key is 32 bytes for Fernet
-        key_bytes = key.encode()[:32].ljust(32, b'0')
-        self.fernet = Fernet(base64.urlsafe_b64encode(key_bytes))
+        self._key = key
+        self._aead = None
+        self._legacy_fernet = None
+    
+    @property
+    def aead(self):
+        """AES-GCM cipher, built on first use to keep cryptography off the import path."""
+        if self._aead is None:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            self._aead = AESGCM(hashlib.sha256(self._key.encode()).digest())
+        return self._aead
+    
+    @property
+    def legacy_fernet(self):
+        """Fernet cipher for values written before the switch to AES-GCM."""
+        if self._legacy_fernet is None:
+            from cryptography.fernet import Fernet
+            key_bytes = self._key.encode()[:32].ljust(32, b'0')
+            self._legacy_fernet = Fernet(base64.urlsafe_b64encode(key_bytes))
+        return self._legacy_fernet
     
     def encrypt(self, data: str) -> str:
         """Encrypt a string."""
         if not data:
             return data
-        encrypted = self.fernet.encrypt(data.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
+        nonce = os.urandom(self.NONCE_SIZE)
+        encrypted = self.aead.encrypt(nonce, data.encode(), None)
+        return base64.urlsafe_b64encode(nonce + encrypted).decode()
     
     def decrypt(self, encrypted_data: str) -> str:
         """Decrypt a string."""
         if not encrypted_data:
             return encrypted_data
+        from cryptography.exceptions import InvalidTag
         try:
             decoded = base64.urlsafe_b64decode(encrypted_data.encode())
-            decrypted = self.fernet.decrypt(decoded)
+            try:
+                decrypted = self.aead.decrypt(
+                    decoded[:self.NONCE_SIZE], decoded[self.NONCE_SIZE:], None
+                )
+            except InvalidTag:
+                decrypted = self.legacy_fernet.decrypt(decoded)
             return decrypted.decode()
         except Exception:
             return ""
@@ -70,6 +122,29 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pwd_pool, pwd_context.verify, plain_password, hashed_password)
+
+
+def _verify_dummy_password(plain_password: str) -> bool:
+    """Verify a password against the dummy hash, computing it if needed."""
+    return pwd_context.verify(plain_password, get_dummy_password_hash())
+
+
+async def averify_dummy_password(plain_password: str) -> bool:
+    """Verify a password against the dummy hash without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pwd_pool, _verify_dummy_password, plain_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pwd_pool, pwd_context.hash, password)
+
+
 # JWT token utilities
 def create_access_token(
     data: dict[str, Any],
@@ -133,6 +208,11 @@ def create_refresh_token(
     return encoded_jwt
 
 
+# Verified token payloads keyed by the raw token; tokens are immutable, so
+# a hit only needs its expiry re-checked
+_decoded_tokens: TTLCache = TTLCache(maxsize=4096, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 def decode_token(token: str) -> dict[str, Any]:
     """
     Decode and verify a JWT token.
@@ -146,11 +226,19 @@ def decode_token(token: str) -> dict[str, Any]:
     Raises:
         JWTError: If token is invalid or expired
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    payload = _decoded_tokens.get(token)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            _decoded_tokens.pop(token, None)
+            raise ExpiredSignatureError("Signature has expired.")
         return payload
-    except JWTError as e:
-        raise e
+    
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    # Only tokens with an expiry are cached, so a hit can re-check it
+    if "exp" in payload:
+        _decoded_tokens[token] = payload
+    return payload
 
 
 def verify_token_type(payload: dict[str, Any], expected_type: str) -> bool:
@@ -168,101 +256,157 @@ def verify_token_type(payload: dict[str, Any], expected_type: str) -> bool:
 
 
 # MFA (TOTP) utilities
-class MFAManager:
-    """Manager for MFA operations."""
-    
-    @staticmethod
-    def generate_secret() -> str:
-        """Generate a new TOTP secret."""
-        return pyotp.random_base32()
+
+# Codes recently verified as valid, keyed by (user_id, code). Only successes
+# are cached; a 30 second entry stays inside the +/-1 step verify window
+_totp_results: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Codes already used to log in, keyed by (user_id, code). A code verifies for
+# up to three 30 second steps (valid_window=1), so remember it that long
+_used_totp_codes: TTLCache = TTLCache(maxsize=10_000, ttl=90)
+
+
+# MFA utilities
+
+@lru_cache(maxsize=1024)
+def _totp(secret: str):
+    """Get a TOTP object for a secret, reusing the decoded key on repeat calls."""
+    import pyotp
+    return pyotp.TOTP(secret)
+
+
+def generate_secret() -> str:
+    """Generate a new TOTP secret."""
+    import pyotp
+    return pyotp.random_base32()
+
+
+def get_totp_uri(secret: str, email: str) -> str:
+    """
+    Get TOTP provisioning URI for QR code.
     
-    @staticmethod
-    def get_totp_uri(secret: str, email: str) -> str:
-        """
-        Get TOTP provisioning URI for QR code.
+    Args:
+        secret: TOTP secret
+        email: User email
         
-        Args:
-            secret: TOTP secret
-            email: User email
-            
-        Returns:
-            TOTP URI string
-        """
-        totp = pyotp.TOTP(secret)
-        return totp.provisioning_uri(
-            name=email,
-            issuer_name=settings.MFA_ISSUER_NAME
-        )
+    Returns:
+        TOTP URI string
+    """
+    return _totp(secret).provisioning_uri(
+        name=email,
+        issuer_name=settings.MFA_ISSUER_NAME
+    )
+
+
+def generate_qr_code(uri: str) -> str:
+    """
+    Generate QR code image from TOTP URI.
     
-    @staticmethod
-    def generate_qr_code(uri: str) -> str:
-        """
-        Generate QR code image from TOTP URI.
-        
-        Args:
-            uri: TOTP provisioning URI
-            
-        Returns:
-            Base64 encoded QR code image
-        """
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(uri)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+    Args:
+        uri: TOTP provisioning URI
         
-        return f"data:image/png;base64,{img_str}"
+    Returns:
+        Base64 encoded QR code image
+    """
+    import segno
     
-    @staticmethod
-    def verify_totp(secret: str, code: str, window: int = 1) -> bool:
-        """
-        Verify a TOTP code.
-        
-        Args:
-            secret: TOTP secret
-            code: Code to verify
-            window: Number of time windows to check (allows for clock drift)
-            
-        Returns:
-            True if code is valid
-        """
-        totp = pyotp.TOTP(secret)
-        return totp.verify(code, valid_window=window)
+    # segno writes the PNG directly, without a PIL image in between
+    qr = segno.make(uri, error="m", micro=False)
+    return qr.png_data_uri(scale=10, border=5)
+
+
+def verify_totp(secret: str, code: str, window: int = 1) -> bool:
+    """
+    Verify a TOTP code.
     
-    @staticmethod
-    def generate_backup_codes(count: int = 10) -> list[str]:
-        """
-        Generate backup codes for MFA recovery.
+    Args:
+        secret: TOTP secret
+        code: Code to verify
+        window: Number of time windows to check (allows for clock drift)
         
-        Args:
-            count: Number of codes to generate
-            
-        Returns:
-            List of backup codes
-        """
-        codes = []
-        for _ in range(count):
-            code = secrets.token_hex(4).upper()  # 8 character hex code
-            codes.append(f"{code[:4]}-{code[4:]}")  # Format: XXXX-XXXX
-        return codes
+    Returns:
+        True if code is valid
+    """
+    return _totp(secret).verify(code, valid_window=window)
+
+
+def verify_user_totp(user_id: Any, encrypted_secret: str, code: str) -> bool:
+    """
+    Verify a TOTP code for a user, caching successful results briefly.
     
-    @staticmethod
-    def hash_backup_code(code: str) -> str:
-        """Hash a backup code for storage."""
-        return get_password_hash(code)
+    Args:
+        user_id: User ID
+        encrypted_secret: User's encrypted TOTP secret
+        code: Code to verify
+        
+    Returns:
+        True if code is valid and has not been consumed
+    """
+    key = (str(user_id), code)
+    if key in _used_totp_codes:
+        return False
+    if key in _totp_results:
+        return True
+    secret = field_encryption.decrypt(encrypted_secret)
+    result = verify_totp(secret, code)
+    if result:
+        _totp_results[key] = True
+    return result
+
+
+def consume_totp(user_id: Any, code: str) -> None:
+    """Mark a code as used so it cannot be replayed while still valid."""
+    key = (str(user_id), code)
+    _totp_results.pop(key, None)
+    _used_totp_codes[key] = True
+
+
+def generate_backup_codes(count: int = 10) -> list[str]:
+    """
+    Generate backup codes for MFA recovery.
     
-    @staticmethod
-    def verify_backup_code(code: str, hashed_code: str) -> bool:
-        """Verify a backup code against its hash."""
-        return verify_password(code, hashed_code)
+    Args:
+        count: Number of codes to generate
+        
+    Returns:
+        List of backup codes
+    """
+    # One entropy read for all codes, 4 bytes (8 hex chars) each
+    entropy = os.urandom(4 * count).hex().upper()
+    codes = []
+    for i in range(0, len(entropy), 8):
+        code = entropy[i:i + 8]
+        codes.append(f"{code[:4]}-{code[4:]}")  # Format: XXXX-XXXX
+    return codes
+
+
+def hash_backup_code(code: str) -> str:
+    """Hash a backup code for storage."""
+    return get_password_hash(code)
+
+
+def verify_backup_code(code: str, hashed_code: str) -> bool:
+    """Verify a backup code against its hash."""
+    return verify_password(code, hashed_code)
+
+
+# Backward-compatible namespace: MFAManager.verify_totp(...) and friends
+# resolve to the module-level functions above
+MFAManager = sys.modules[__name__]
 
 
 # API Key utilities
+
+# API keys carry 256 bits of entropy, so a keyed hash is enough; the
+# password KDF is only kept for verifying keys issued before this change
+_API_KEY_HASH_KEY = hashlib.sha256(settings.SECRET_KEY.encode()).digest()
+
+
+def hash_api_key(key: str) -> str:
+    """Hash an API key with keyed BLAKE2b."""
+    return hashlib.blake2b(key.encode(), key=_API_KEY_HASH_KEY, digest_size=32).hexdigest()
+
+
 def generate_api_key() -> tuple[str, str, str]:
     """
     Generate a new API key.
@@ -273,17 +417,25 @@ def generate_api_key() -> tuple[str, str, str]:
     # Generate key with prefix
     key = f"lex_{secrets.token_urlsafe(32)}"
     prefix = key[:12]
-    hashed_key = get_password_hash(key)
+    hashed_key = hash_api_key(key)
     
     return key, prefix, hashed_key
 
 
 def verify_api_key(plain_key: str, hashed_key: str) -> bool:
     """Verify an API key against its hash."""
-    return verify_password(plain_key, hashed_key)
+    if hashed_key.startswith("$"):
+        # Legacy argon2/bcrypt hash
+        return verify_password(plain_key, hashed_key)
+    return hmac.compare_digest(hash_api_key(plain_key), hashed_key)
 
 
 # Session utilities
+def hash_token(token: str) -> bytes:
+    """Hash a session token to the fixed-size digest used for lookups."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 def generate_session_id() -> str:
     """Generate a unique session ID."""
     return secrets.token_urlsafe(32)
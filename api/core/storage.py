@@ -1,44 +1,123 @@
 """Storage utilities for file uploads."""
 import os
 import uuid
-from io import BytesIO
-from minio import Minio
-from minio.error import S3Error
+from contextlib import AsyncExitStack
+from typing import Optional
+
+import aioboto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import UploadFile, HTTPException
 from api.config import settings
 
-# Initialize MinIO client
-minio_endpoint = settings.MINIO_ENDPOINT.replace("http://", "").replace("https://", "")
-minio_client = Minio(
-    endpoint=minio_endpoint,
-    access_key=settings.MINIO_ACCESS_KEY,
-    secret_key=settings.MINIO_SECRET_KEY,
-    secure=settings.MINIO_ENDPOINT.startswith("https://")
-)
+# S3 endpoint for the MinIO server
+if "://" in settings.MINIO_ENDPOINT:
+    S3_ENDPOINT_URL = settings.MINIO_ENDPOINT
+else:
+    S3_ENDPOINT_URL = f"{'https' if settings.MINIO_SECURE else 'http'}://{settings.MINIO_ENDPOINT}"
+
+# Shared async S3 client, opened on first use and closed on shutdown
+_s3_session = aioboto3.Session()
+_s3_stack: Optional[AsyncExitStack] = None
+_s3_client = None
+
+
+async def get_s3_client():
+    """Get the shared S3 client, creating it on first use."""
+    global _s3_stack, _s3_client
+    if _s3_client is None:
+        stack = AsyncExitStack()
+        _s3_client = await stack.enter_async_context(
+            _s3_session.client(
+                "s3",
+                endpoint_url=S3_ENDPOINT_URL,
+                aws_access_key_id=settings.MINIO_ACCESS_KEY,
+                aws_secret_access_key=settings.MINIO_SECRET_KEY,
+            )
+        )
+        _s3_stack = stack
+    return _s3_client
+
+
+async def close_storage() -> None:
+    """
+    Close the shared S3 client.
+    Should be called on application shutdown.
+    """
+    global _s3_stack, _s3_client
+    if _s3_stack is not None:
+        await _s3_stack.aclose()
+    _s3_stack = None
+    _s3_client = None
 
-# Ensure bucket exists
 AVATARS_BUCKET = "avatars"
-try:
-    if not minio_client.bucket_exists(bucket_name=AVATARS_BUCKET):
-        minio_client.make_bucket(bucket_name=AVATARS_BUCKET)
+BANNERS_BUCKET = "banners"
+
+# Accepted upload content types
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+_INVALID_TYPE_DETAIL = f"Invalid file type. Allowed types: {', '.join(sorted(ALLOWED_IMAGE_TYPES))}"
+
+# Public read policy, formatted with the bucket name
+_PUBLIC_READ_POLICY = (
+    '{"Version":"2012-10-17","Statement":[{"Effect":"Allow","Principal":{"AWS":["*"]},'
+    '"Action":["s3:GetObject"],"Resource":["arn:aws:s3:::%s/*"]}]}'
+)
+
+# Buckets already created and given the public read policy by this process
+_POLICIES_SET: set[str] = set()
+
+
+async def _ensure_bucket(bucket_name: str) -> None:
+    """Create a bucket with a public read policy, once per process."""
+    if bucket_name in _POLICIES_SET:
+        return
     
-    # Always ensure public read policy
-    policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Principal": {"AWS": ["*"]},
-                "Action": ["s3:GetObject"],
-                "Resource": [f"arn:aws:s3:::{AVATARS_BUCKET}/*"]
-            }
-        ]
-    }
-    import json
-    minio_client.set_bucket_policy(bucket_name=AVATARS_BUCKET, policy=json.dumps(policy))
-        
-except S3Error as e:
-    print(f"Error configuring bucket: {e}")
+    s3 = await get_s3_client()
+    try:
+        try:
+            await s3.head_bucket(Bucket=bucket_name)
+        except ClientError:
+            await s3.create_bucket(Bucket=bucket_name)
+        await s3.put_bucket_policy(
+            Bucket=bucket_name,
+            Policy=_PUBLIC_READ_POLICY % bucket_name
+        )
+        _POLICIES_SET.add(bucket_name)
+    except (BotoCoreError, ClientError) as e:
+        print(f"Error configuring bucket {bucket_name}: {e}")
+
+
+# Multipart part size for uploads; bounds memory per upload
+UPLOAD_PART_SIZE = 5 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=UPLOAD_PART_SIZE,
+    multipart_chunksize=UPLOAD_PART_SIZE,
+)
+
+
+def _file_size(file: UploadFile) -> int:
+    """Get the size of an uploaded file without reading it into memory."""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def _sniff_image_type(file: UploadFile) -> Optional[str]:
+    """Detect the image type from the file's magic bytes."""
+    head = file.file.read(12)
+    file.file.seek(0)
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
 
 
 async def upload_avatar(file: UploadFile, user_id: str) -> str:
@@ -53,41 +132,44 @@ async def upload_avatar(file: UploadFile, user_id: str) -> str:
         str: The URL to access the uploaded file
     """
     # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
-        )
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail=_INVALID_TYPE_DETAIL)
     
     # Validate file size (5MB)
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
+    size = _file_size(file)
+    if size > 5 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File size must be less than 5MB")
     
+    # Validate the actual content, not just the client-supplied type
+    content_type = _sniff_image_type(file)
+    if content_type is None:
+        raise HTTPException(status_code=400, detail="File content is not a supported image")
+    
     # Generate unique filename
     file_extension = file.filename.split(".")[-1] if "." in file.filename else "jpg"
     filename = f"{user_id}/{uuid.uuid4()}.{file_extension}"
     
     try:
         # Upload to MinIO
-        minio_client.put_object(
-            bucket_name=AVATARS_BUCKET,
-            object_name=filename,
-            data=BytesIO(contents),
-            length=len(contents),
-            content_type=file.content_type
+        await _ensure_bucket(AVATARS_BUCKET)
+        s3 = await get_s3_client()
+        await s3.upload_fileobj(
+            file.file,
+            AVATARS_BUCKET,
+            filename,
+            ExtraArgs={"ContentType": content_type},
+            Config=_TRANSFER_CONFIG
         )
         
         # Return public URL
         protocol = "https" if settings.MINIO_SECURE else "http"
         return f"{protocol}://{settings.MINIO_ENDPOINT}/{AVATARS_BUCKET}/{filename}"
     
-    except S3Error as e:
+    except (BotoCoreError, ClientError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
 
-def delete_avatar(avatar_url: str):
+async def delete_avatar(avatar_url: str):
     """Delete avatar from MinIO storage."""
     if not avatar_url or AVATARS_BUCKET not in avatar_url:
         return
@@ -95,36 +177,12 @@ def delete_avatar(avatar_url: str):
     try:
         # Extract filename from URL
         filename = avatar_url.split(f"/{AVATARS_BUCKET}/")[1]
-        minio_client.remove_object(bucket_name=AVATARS_BUCKET, object_name=filename)
+        s3 = await get_s3_client()
+        await s3.delete_object(Bucket=AVATARS_BUCKET, Key=filename)
     except Exception as e:
         print(f"Error deleting avatar: {e}")
 
 
-# Ensure banners bucket exists
-BANNERS_BUCKET = "banners"
-try:
-    if not minio_client.bucket_exists(bucket_name=BANNERS_BUCKET):
-        minio_client.make_bucket(bucket_name=BANNERS_BUCKET)
-    
-    # Always ensure public read policy
-    policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Principal": {"AWS": ["*"]},
-                "Action": ["s3:GetObject"],
-                "Resource": [f"arn:aws:s3:::{BANNERS_BUCKET}/*"]
-            }
-        ]
-    }
-    import json
-    minio_client.set_bucket_policy(bucket_name=BANNERS_BUCKET, policy=json.dumps(policy))
-        
-except S3Error as e:
-    print(f"Error configuring banners bucket: {e}")
-
-
 async def upload_banner(file: UploadFile, user_id: str) -> str:
     """
     Upload user banner to MinIO storage.
@@ -137,41 +195,44 @@ async def upload_banner(file: UploadFile, user_id: str) -> str:
         str: The URL to access the uploaded file
     """
     # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
-        )
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail=_INVALID_TYPE_DETAIL)
     
     # Validate file size (10MB for banners)
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
+    size = _file_size(file)
+    if size > 10 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File size must be less than 10MB")
     
+    # Validate the actual content, not just the client-supplied type
+    content_type = _sniff_image_type(file)
+    if content_type is None:
+        raise HTTPException(status_code=400, detail="File content is not a supported image")
+    
     # Generate unique filename
     file_extension = file.filename.split(".")[-1] if "." in file.filename else "jpg"
     filename = f"{user_id}/{uuid.uuid4()}.{file_extension}"
     
     try:
         # Upload to MinIO
-        minio_client.put_object(
-            bucket_name=BANNERS_BUCKET,
-            object_name=filename,
-            data=BytesIO(contents),
-            length=len(contents),
-            content_type=file.content_type
+        await _ensure_bucket(BANNERS_BUCKET)
+        s3 = await get_s3_client()
+        await s3.upload_fileobj(
+            file.file,
+            BANNERS_BUCKET,
+            filename,
+            ExtraArgs={"ContentType": content_type},
+            Config=_TRANSFER_CONFIG
         )
         
         # Return public URL
         protocol = "https" if settings.MINIO_SECURE else "http"
         return f"{protocol}://{settings.MINIO_ENDPOINT}/{BANNERS_BUCKET}/{filename}"
     
-    except S3Error as e:
+    except (BotoCoreError, ClientError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
 
-def delete_banner(banner_url: str):
+async def delete_banner(banner_url: str):
     """Delete banner from MinIO storage."""
     if not banner_url or BANNERS_BUCKET not in banner_url:
         return
@@ -179,6 +240,7 @@ def delete_banner(banner_url: str):
     try:
         # Extract filename from URL
         filename = banner_url.split(f"/{BANNERS_BUCKET}/")[1]
-        minio_client.remove_object(bucket_name=BANNERS_BUCKET, object_name=filename)
+        s3 = await get_s3_client()
+        await s3.delete_object(Bucket=BANNERS_BUCKET, Key=filename)
     except Exception as e:
         print(f"Error deleting banner: {e}")
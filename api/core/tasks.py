@@ -2,15 +2,22 @@
 Background tasks for Lexicon using Celery.
 """
 from datetime import datetime, timedelta
+from itertools import groupby
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from api.core.celery_app import celery_app
 from api.database import SessionLocal
-from api.core import crud
+from api.core.models import User
 from api.core.email_service import EmailService
 from api.modules.tasks.models import Task, TaskStatus
 import asyncio
 
 
+async def _send_all(coros):
+    """Send queued emails concurrently on a single event loop."""
+    return await asyncio.gather(*coros, return_exceptions=True)
+
+
 @celery_app.task(name="api.core.tasks.check_task_deadlines")
 def check_task_deadlines():
     """
@@ -25,62 +32,54 @@ def check_task_deadlines():
         in_24h = now + timedelta(hours=24)
         in_1h = now + timedelta(hours=1)
         
-        # Get all users
-        users = crud.user_crud.get_multi(db, limit=10000)
-        
-        for user in users:
-            # Get user's incomplete tasks with deadlines
-            user_tasks = (
-                db.query(Task)
-                .filter(
-                    Task.user_id == user.id,
-                    Task.due_date.isnot(None),
-                    Task.status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED]),
-                )
-                .all()
+        # Stream every incomplete task that still needs a notification, with
+        # just the owner columns the email uses, ordered so tasks can be
+        # grouped by user
+        rows = (
+            db.query(Task, User.email, User.full_name, User.username)
+            .join(User, Task.user_id == User.id)
+            .filter(
+                Task.due_date.isnot(None),
+                Task.status.notin_([TaskStatus.COMPLETED.value, TaskStatus.CANCELLED.value]),
+                Task.due_date <= in_24h,
+                or_(
+                    and_(Task.due_date < now, Task.notification_overdue_sent == False),
+                    and_(Task.due_date >= now, Task.due_date <= in_1h, Task.notification_1h_sent == False),
+                    and_(Task.due_date > in_1h, Task.notification_24h_sent == False),
+                ),
             )
-            
-            if not user_tasks:
-                continue
+            .order_by(Task.user_id)
+            .yield_per(1000)
+        )
+        
+        pending_emails = []
+        # Per queued email: (email, overdue ids, 1h ids, 24h ids)
+        recipients = []
+        
+        for _, user_rows in groupby(rows, key=lambda row: row.Task.user_id):
+            user_rows = list(user_rows)
+            # Row exposes email/full_name/username like a User
+            user = user_rows[0]
+            user_tasks = [row.Task for row in user_rows]
             
             # Categorize tasks
             tasks_24h = []
             tasks_1h = []
             tasks_overdue = []
             
+            # The query only returns tasks whose notification for their
+            # window hasn't been sent yet
             for task in user_tasks:
-                due_date = task.due_date
-                
-                # Skip if no due date
-                if not due_date:
-                    continue
-                
-                # Check if overdue
-                if due_date < now:
-                    # Only send overdue notification if not already sent
-                    if not task.notification_overdue_sent:
-                        tasks_overdue.append(task)
-                        task.notification_overdue_sent = True
-                        task.last_notification_at = now
-                
-                # Check if due in 1 hour
-                elif due_date <= in_1h:
-                    if not task.notification_1h_sent:
-                        tasks_1h.append(task)
-                        task.notification_1h_sent = True
-                        task.last_notification_at = now
-                
-                # Check if due in 24 hours
-                elif due_date <= in_24h:
-                    if not task.notification_24h_sent:
-                        tasks_24h.append(task)
-                        task.notification_24h_sent = True
-                        task.last_notification_at = now
+                if task.due_date < now:
+                    tasks_overdue.append(task)
+                elif task.due_date <= in_1h:
+                    tasks_1h.append(task)
+                else:
+                    tasks_24h.append(task)
             
-            # Send grouped notification if there are any tasks
+            # Queue grouped notification if there are any tasks
             if tasks_24h or tasks_1h or tasks_overdue:
-                # Send email asynchronously
-                asyncio.run(
+                pending_emails.append(
                     EmailService.send_task_deadline_notifications(
                         user=user,
                         tasks_24h=tasks_24h,
@@ -88,17 +87,53 @@ def check_task_deadlines():
                         tasks_overdue=tasks_overdue,
                     )
                 )
-                
-                # Commit notification tracking updates
-                db.commit()
-                
-                print(f"✅ Sent deadline notification to {user.email}: "
-                      f"{len(tasks_overdue)} overdue, {len(tasks_1h)} in 1h, {len(tasks_24h)} in 24h")
+                recipients.append((
+                    user.email,
+                    [task.id for task in tasks_overdue],
+                    [task.id for task in tasks_1h],
+                    [task.id for task in tasks_24h],
+                ))
+        
+        # Send all emails on one event loop
+        results = asyncio.run(_send_all(pending_emails)) if pending_emails else []
+        
+        # Only flag the tasks whose email actually went out, so failed
+        # sends are retried on the next run
+        overdue_ids = []
+        h1_ids = []
+        h24_ids = []
+        users_notified = 0
+        for (email, user_overdue, user_h1, user_h24), result in zip(recipients, results):
+            if isinstance(result, BaseException):
+                print(f"❌ Failed to send deadline notification to {email}: {result}")
+                continue
+            if not result:
+                print(f"❌ Failed to send deadline notification to {email}")
+                continue
+            overdue_ids.extend(user_overdue)
+            h1_ids.extend(user_h1)
+            h24_ids.extend(user_h24)
+            users_notified += 1
+            print(f"✅ Sent deadline notification to {email}: "
+                  f"{len(user_overdue)} overdue, {len(user_h1)} in 1h, {len(user_h24)} in 24h")
+        
+        # Record sent notifications with one UPDATE per window
+        for ids, flag in (
+            (overdue_ids, "notification_overdue_sent"),
+            (h1_ids, "notification_1h_sent"),
+            (h24_ids, "notification_24h_sent"),
+        ):
+            if ids:
+                db.query(Task).filter(Task.id.in_(ids)).update(
+                    {flag: True, "last_notification_at": now},
+                    synchronize_session=False
+                )
+        db.commit()
         
         return {
             "status": "success",
             "checked_at": now.isoformat(),
-            "users_notified": sum(1 for u in users if any([tasks_24h, tasks_1h, tasks_overdue])),
+            "users_notified": users_notified,
         }
     
     except Exception as e:
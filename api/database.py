@@ -2,8 +2,10 @@
 Database configuration and session management for Lexicon.
 Supports both sync and async database operations.
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
@@ -21,13 +23,45 @@ convention = {
 
 metadata = MetaData(naming_convention=convention)
 
+_IS_POSTGRES = make_url(settings.DATABASE_URL).get_backend_name() == "postgresql"
+
+
+def get_connect_args() -> dict:
+    """Get libpq connect args for the sync engine."""
+    if not _IS_POSTGRES:
+        return {}
+    # Timestamps are stored as naive UTC, so now() must be evaluated in UTC
+    options = "-c timezone=UTC"
+    if settings.DATABASE_DISABLE_JIT:
+        options += " -c jit=off"
+    return {"options": options}
+
+
+def get_async_connect_args() -> dict:
+    """Get asyncpg connect args: statement caches and server settings."""
+    if not _IS_POSTGRES:
+        return {}
+    connect_args = {
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+    server_settings = {"timezone": "UTC"}
+    if settings.DATABASE_DISABLE_JIT:
+        server_settings["jit"] = "off"
+    connect_args["server_settings"] = server_settings
+    return connect_args
+
+
 # Create engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
+    connect_args=get_connect_args(),
     poolclass=QueuePool,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
     pool_pre_ping=True,  # Verify connections before using
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,  # Compiled SQL cache entries
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
@@ -39,6 +73,38 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+
+def get_async_database_url() -> str:
+    """Get the async driver URL (asyncpg/aiosqlite) for DATABASE_URL."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return settings.DATABASE_URL
+
+
+# Async engine for request handlers; the sync engine above stays for
+# Celery tasks, scripts and routes not yet migrated
+async_engine = create_async_engine(
+    get_async_database_url(),
+    connect_args=get_async_connect_args(),
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+)
+
+# Async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for models
 Base = declarative_base(metadata=metadata)
 
@@ -60,6 +126,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting async database sessions.
+    
+    Usage:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
     """
     Initialize database tables.
@@ -77,12 +156,13 @@ def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
 
-def close_db() -> None:
+async def close_db() -> None:
     """
     Close database connections.
     Should be called on application shutdown.
     """
     engine.dispose()
+    await async_engine.dispose()
 
 
 # Event listeners for connection management
@@ -0,0 +1,40 @@
+"""
+Logging setup for Lexicon API.
+Records are handed to a queue and written by a background listener thread,
+so request and startup code never blocks on stdout.
+"""
+import atexit
+import logging
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
+
+from api.config import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """
+    Route the "api" logger hierarchy through a QueueHandler.
+    Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log_queue = SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    logger = logging.getLogger("api")
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    logger.propagate = False
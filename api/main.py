@@ -2,48 +2,57 @@
 Lexicon API - Main application entry point.
 """
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+import logging
+import orjson
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
 from api.config import settings
+from api.log import setup_logging
 from api.database import init_db, close_db
+from api.middleware import PureCorsMiddleware
+from api.core.storage import close_storage
 from api.core.routes import router as core_router
 from api.modules.tasks import router as tasks_router
 from api.modules.notes import router as notes_router
-from api.modules import loader
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    print("🚀 Starting Lexicon API...")
+    logger.info("🚀 Starting Lexicon API...")
     
     # Initialize database
-    print("📊 Initializing database...")
+    logger.info("📊 Initializing database...")
     init_db()
     
     # Initialize default roles and permissions
-    print("🔐 Setting up default roles and permissions...")
+    logger.info("🔐 Setting up default roles and permissions...")
     from api.core.init_data import init_default_data
+    from api.core.identity_filter import identity_filter
     from api.database import SessionLocal
     db = SessionLocal()
     try:
         init_default_data(db)
+        identity_filter.load(db)
     finally:
         db.close()
     
-    print("✅ Lexicon API started successfully!")
+    logger.info("✅ Lexicon API started successfully!")
     
     yield
     
     # Shutdown
-    print("👋 Shutting down Lexicon API...")
-    close_db()
-    print("✅ Shutdown complete")
+    logger.info("👋 Shutting down Lexicon API...")
+    await close_db()
+    await close_storage()
+    logger.info("✅ Shutdown complete")
 
 
 # Create FastAPI application
@@ -52,6 +61,7 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -59,11 +69,12 @@ app = FastAPI(
 
 # CORS Middleware
 app.add_middleware(
-    CORSMiddleware,
+    PureCorsMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
+    max_age=settings.CORS_MAX_AGE,
 )
 
 
@@ -71,7 +82,7 @@ app.add_middleware(
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": exc.errors(),
@@ -82,7 +93,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle database errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Database error occurred",
@@ -91,26 +102,31 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     )
 
 
+# Static response bodies, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "version": settings.APP_VERSION,
+    "environment": settings.ENVIRONMENT,
+})
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Lexicon API!",
+    "version": settings.APP_VERSION,
+    "docs": "/docs" if settings.DEBUG else "Documentation disabled in production",
+})
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": settings.APP_VERSION,
-        "environment": settings.ENVIRONMENT,
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "Welcome to Lexicon API!",
-        "version": settings.APP_VERSION,
-        "docs": "/docs" if settings.DEBUG else "Documentation disabled in production",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # Include routers
@@ -120,7 +136,9 @@ app.include_router(notes_router)
 
 # Auto-discover and register module routers
 if settings.MODULES_AUTO_DISCOVER:
-    print("🔍 Auto-discovering modules...")
+    from api.modules import loader
+    
+    logger.info("🔍 Auto-discovering modules...")
     loader.register_module_routers(app)
-    print("✅ Modules registered")
+    logger.info("✅ Modules registered")
 
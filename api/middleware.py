@@ -0,0 +1,159 @@
+"""
+ASGI middleware for Lexicon API.
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = frozenset({"accept", "accept-language", "content-language", "content-type"})
+
+
+class PureCorsMiddleware:
+    """
+    CORS middleware working directly on ASGI messages.
+
+    All response headers are encoded once at startup; preflight requests
+    are answered without entering the application, and simple requests
+    only get their start message patched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: list[str] = (),
+        allow_methods: list[str] = ("GET",),
+        allow_headers: list[str] = (),
+        allow_credentials: bool = False,
+        expose_headers: list[str] = (),
+        max_age: int = 600,
+    ):
+        self.app = app
+
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_credentials = allow_credentials
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_methods = frozenset(method.encode("latin-1") for method in allow_methods)
+        self.allow_headers = SAFELISTED_HEADERS | {header.lower() for header in allow_headers}
+
+        # Headers added to every preflight response
+        preflight_headers = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+        if not self.allow_all_headers:
+            preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(sorted(self.allow_headers)).encode("latin-1"))
+            )
+
+        # Headers added to every response to an allowed origin
+        simple_headers = []
+        if allow_credentials:
+            simple_headers.append((b"access-control-allow-credentials", b"true"))
+        if expose_headers:
+            simple_headers.append((b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1")))
+
+        # Origins are echoed back unless every origin is allowed without credentials
+        self.echo_origin = not self.allow_all_origins or allow_credentials
+        self.preflight_headers = tuple(preflight_headers) + tuple(simple_headers)
+        self.simple_headers = tuple(simple_headers)
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        """Check an Origin header value against the allowed origins."""
+        return self.allow_all_origins or origin in self.allow_origins
+
+    def origin_headers(self, origin: bytes) -> tuple:
+        """Get the Allow-Origin header (and Vary, when echoing) for an origin."""
+        if self.echo_origin:
+            return ((b"access-control-allow-origin", origin), (b"vary", b"Origin"))
+        return ((b"access-control-allow-origin", b"*"),)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        # Not a CORS request
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight_response(send, origin, request_method, request_headers)
+            return
+
+        if not self.is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = self.simple_headers + self.origin_headers(origin)
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                for name, value in extra_headers:
+                    if name == b"vary":
+                        # Merge with any Vary the application already set
+                        for index, (existing, existing_value) in enumerate(headers):
+                            if existing == b"vary":
+                                headers[index] = (b"vary", existing_value + b", " + value)
+                                break
+                        else:
+                            headers.append((name, value))
+                    else:
+                        headers.append((name, value))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight_response(
+        self,
+        send: Send,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: bytes | None,
+    ) -> None:
+        """Answer a CORS preflight request without calling the application."""
+        failures = []
+        allowed_origin = self.is_allowed_origin(origin)
+        if not allowed_origin:
+            failures.append("origin")
+        if request_method not in self.allow_methods:
+            failures.append("method")
+        if request_headers and not self.allow_all_headers:
+            for header in request_headers.decode("latin-1").split(","):
+                if header.strip().lower() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        headers = list(self.preflight_headers)
+        if allowed_origin:
+            headers.extend(self.origin_headers(origin))
+        if self.allow_all_headers and request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        if failures:
+            status = 400
+            body = ("Disallowed CORS " + ", ".join(failures)).encode("utf-8")
+        else:
+            status = 200
+            body = b"OK"
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,59 @@
+"""
+Database migration script for notes column types and indexes.
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Convert notes.tags to JSONB and add the notes search column and indexes."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE notes ALTER COLUMN tags TYPE JSONB USING tags::jsonb"
+        ))
+        print("✓ Converted notes.tags to JSONB")
+        
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notes_tags_gin ON notes USING gin (tags jsonb_path_ops)"
+        ))
+        print("✓ Created tags GIN index")
+        
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notes_user_listing "
+            "ON notes (user_id, is_pinned, updated_at)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notes_user_archived "
+            "ON notes (user_id, updated_at) WHERE is_archived = false"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notes_user_favorite "
+            "ON notes (user_id) WHERE is_favorite = true"
+        ))
+        print("✓ Created listing indexes")
+        
+        conn.execute(text(
+            "ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notes_search_gin ON notes USING gin (search_vector)"
+        ))
+        print("✓ Added full-text search column and index")
+        
+        for index_name in ("ix_notes_is_pinned", "ix_notes_is_archived", "ix_notes_is_favorite"):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        print("✓ Dropped single-column flag indexes")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,78 @@
+"""
+Database migration script to replace session tokens with hashed token columns.
+"""
+import hashlib
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Backfill access_token_hash/refresh_token_hash and drop the plaintext token columns."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE sessions "
+            "ADD COLUMN IF NOT EXISTS access_token_hash BYTEA, "
+            "ADD COLUMN IF NOT EXISTS refresh_token_hash BYTEA"
+        ))
+        print("✓ Added token hash columns")
+        
+        # Backfill existing sessions while the plaintext columns still exist
+        has_plaintext = conn.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'sessions' AND column_name = 'access_token'"
+        )).first() is not None
+        rows = conn.execute(text(
+            "SELECT id, access_token, refresh_token FROM sessions "
+            "WHERE access_token_hash IS NULL OR refresh_token_hash IS NULL"
+        )).fetchall() if has_plaintext else []
+        for session_id, access_token, refresh_token in rows:
+            conn.execute(
+                text(
+                    "UPDATE sessions SET access_token_hash = :access_hash, "
+                    "refresh_token_hash = :refresh_hash WHERE id = :id"
+                ),
+                {
+                    "id": session_id,
+                    "access_hash": hashlib.sha256(access_token.encode()).digest(),
+                    "refresh_hash": hashlib.sha256(refresh_token.encode()).digest(),
+                },
+            )
+        print(f"✓ Backfilled {len(rows)} sessions")
+        
+        conn.execute(text(
+            "ALTER TABLE sessions "
+            "ALTER COLUMN access_token_hash SET NOT NULL, "
+            "ALTER COLUMN refresh_token_hash SET NOT NULL"
+        ))
+        
+        # Sessions are looked up by hash only; the hash indexes take over uniqueness
+        conn.execute(text("DROP INDEX IF EXISTS ix_sessions_access_token_hash"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_sessions_refresh_token_hash"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX ix_sessions_access_token_hash ON sessions (access_token_hash)"
+        ))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX ix_sessions_refresh_token_hash ON sessions (refresh_token_hash)"
+        ))
+        print("✓ Created unique token hash indexes")
+        
+        # Dropping the columns also drops their unique indexes
+        conn.execute(text(
+            "ALTER TABLE sessions "
+            "DROP COLUMN IF EXISTS access_token, "
+            "DROP COLUMN IF EXISTS refresh_token"
+        ))
+        print("✓ Dropped plaintext token columns")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,51 @@
+"""
+Database migration script to store task status and priority as checked strings.
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Convert tasks.status/priority from Postgres enums (member names) to VARCHAR values."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        # The partial index predicate compares against the old enum labels
+        conn.execute(text("DROP INDEX IF EXISTS ix_tasks_user_due_pending"))
+        
+        conn.execute(text(
+            "ALTER TABLE tasks "
+            "ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text), "
+            "ALTER COLUMN priority TYPE VARCHAR(16) USING lower(priority::text)"
+        ))
+        conn.execute(text("DROP TYPE IF EXISTS taskstatus"))
+        conn.execute(text("DROP TYPE IF EXISTS taskpriority"))
+        print("✓ Converted status and priority to VARCHAR")
+        
+        conn.execute(text(
+            "ALTER TABLE tasks "
+            "DROP CONSTRAINT IF EXISTS ck_tasks_status, "
+            "ADD CONSTRAINT ck_tasks_status "
+            "CHECK (status IN ('todo', 'in_progress', 'completed', 'cancelled')), "
+            "DROP CONSTRAINT IF EXISTS ck_tasks_priority, "
+            "ADD CONSTRAINT ck_tasks_priority "
+            "CHECK (priority IN ('low', 'medium', 'high', 'urgent'))"
+        ))
+        print("✓ Added CHECK constraints")
+        
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_user_due_pending ON tasks (user_id, due_date) "
+            "WHERE status NOT IN ('completed', 'cancelled') AND due_date IS NOT NULL"
+        ))
+        print("✓ Recreated pending-deadline index")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,29 @@
+"""
+Database migration script to let the database set task timestamps.
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Add now() defaults to tasks.created_at and tasks.updated_at."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE tasks "
+            "ALTER COLUMN created_at SET DEFAULT now(), "
+            "ALTER COLUMN updated_at SET DEFAULT now()"
+        ))
+        print("✓ Added now() defaults to created_at and updated_at")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
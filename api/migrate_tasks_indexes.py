@@ -0,0 +1,40 @@
+"""
+Database migration script for tasks indexes.
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Replace the tasks filter indexes with ones covering the list ordering."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_user_created "
+            "ON tasks (user_id, created_at, id)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_user_status_created "
+            "ON tasks (user_id, status, created_at)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_user_priority_created "
+            "ON tasks (user_id, priority, created_at)"
+        ))
+        print("✓ Created task listing indexes")
+        
+        for index_name in ("ix_tasks_user_status", "ix_tasks_user_priority"):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        print("✓ Dropped superseded task indexes")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,30 @@
+"""
+Database migration script to add banner and password reset fields to users table.
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.config import settings
+
+def migrate():
+    """Add banner_url, reset_token and reset_token_expires columns to users table."""
+    engine = create_engine(settings.DATABASE_URL)
+    
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE users "
+            "ADD COLUMN IF NOT EXISTS banner_url VARCHAR(500), "
+            "ADD COLUMN IF NOT EXISTS reset_token VARCHAR(255), "
+            "ADD COLUMN IF NOT EXISTS reset_token_expires TIMESTAMP"
+        ))
+        print("✓ Added banner_url, reset_token and reset_token_expires columns")
+        
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
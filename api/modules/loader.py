@@ -1,25 +1,28 @@
-import importlib.util
+import functools
+import importlib
+import logging
 import os
+import sys
 from fastapi import FastAPI, APIRouter
 from pathlib import Path
 from typing import Dict, Any
 
 MODULES_DIR = Path(__file__).parent
 
+logger = logging.getLogger(__name__)
+
+@functools.cache
+def _import(module_name: str):
+    """Imports a module once, reusing sys.modules on repeat calls."""
+    return sys.modules.get(module_name) or importlib.import_module(module_name)
+
 def load_module_config(module_path: Path) -> Dict[str, Any] | None:
     """Loads the module_config from a module's module_config.py file."""
     config_file = module_path / "module_config.py"
     if not config_file.exists():
         return None
 
-    spec = importlib.util.spec_from_file_location("module_config", config_file)
-    if spec is None:
-        return None
-    module_config_module = importlib.util.module_from_spec(spec)
-    if spec.loader is None:
-        return None
-    spec.loader.exec_module(module_config_module)
-
+    module_config_module = _import(f"{__package__}.{module_path.name}.module_config")
     return getattr(module_config_module, "module_config", None)
 
 def register_module_routers(app: FastAPI):
@@ -27,8 +30,14 @@ def register_module_routers(app: FastAPI):
     Scans the modules directory, loads module configurations,
     and registers their API routers with the FastAPI application.
     """
-    for module_path in MODULES_DIR.iterdir():
-        if module_path.is_dir() and not module_path.name.startswith("__"):
+    with os.scandir(MODULES_DIR) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False) or entry.name.startswith("__"):
+                continue
+            # Skip non-module directories without building a Path or importing
+            if not os.path.exists(os.path.join(entry.path, "module_config.py")):
+                continue
+            module_path = Path(entry.path)
             module_config = load_module_config(module_path)
             if module_config and "api_router" in module_config:
                 router_path = module_path / module_config["api_router"]
@@ -38,11 +47,11 @@ def register_module_routers(app: FastAPI):
                         relative_path = os.path.relpath(router_path, Path(__file__).parent.parent)
                         module_name = relative_path.replace("\\", ".").replace("/", ".").replace(".py", "")
                         
-                        router_module = importlib.import_module(f"api.{module_name}")
+                        router_module = _import(f"api.{module_name}")
                         router: APIRouter = getattr(router_module, "router")
                         
                         # Register the router with a prefix from the module's slug
                         app.include_router(router, prefix=f"/api/v1/{module_config['slug']}", tags=[module_config['name']])
-                        print(f"Registered API routes for module: {module_config['name']} at /api/v1/{module_config['slug']}")
+                        logger.info("Registered API routes for module: %s at /api/v1/%s", module_config['name'], module_config['slug'])
                     except Exception as e:
-                        print(f"Error loading router for module {module_path.name}: {e}")
+                        logger.error("Error loading router for module %s: %s", module_path.name, e)
@@ -1,8 +1,8 @@
 """
 Notes module CRUD operations.
 """
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import and_, func, insert, update
 from typing import List, Optional
 from uuid import UUID
 import re
@@ -10,13 +10,55 @@ import re
 from api.modules.notes.models import Note, NoteCategory, NoteVersion
 from api.modules.notes.schemas import NoteCreate, NoteUpdate, NoteCategoryCreate, NoteCategoryUpdate
 
+# HTML tag pattern used for metadata and previews
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WORD_RE = re.compile(r'\S+')
 
-def calculate_metadata(content: str) -> dict:
+# Previews only need the start of a note; bound the tag stripping to this prefix
+PREVIEW_SCAN_CHARS = 4096
+PREVIEW_LENGTH = 150
+
+# Category alias so list rows expose it under the "category" key
+_ListCategory = aliased(NoteCategory, name="category")
+
+# List view columns: everything but the full content, which is replaced by
+# a preview computed in the database (one extra char to detect truncation).
+# A tag cut off at the scan limit has no closing '>', so that tail is dropped
+# before complete tags are stripped
+NOTE_LIST_COLUMNS = (
+    Note.id,
+    Note.title,
+    func.substring(
+        func.regexp_replace(
+            func.regexp_replace(
+                func.substring(Note.content, 1, PREVIEW_SCAN_CHARS), '<[^>]*$', ''
+            ),
+            '<[^>]+>',
+            '',
+            'g',
+        ),
+        1,
+        PREVIEW_LENGTH + 1,
+    ).label("content_preview"),
+    Note.category_id,
+    _ListCategory,
+    Note.tags,
+    Note.is_pinned,
+    Note.is_archived,
+    Note.is_favorite,
+    Note.word_count,
+    Note.created_at,
+    Note.updated_at,
+)
+
+
+def calculate_metadata(content: str, content_type: str = "html") -> dict:
     """Calculate word count, character count, and reading time."""
-    # Remove HTML tags for accurate word count
-    text = re.sub(r'<[^>]+>', '', content)
+    # Remove HTML tags for accurate word count; other formats have none
+    text = HTML_TAG_RE.sub('', content) if content_type == "html" else content
     
-    words = len(text.split())
+    # Count words without building a list of them
+    words = sum(1 for _ in WORD_RE.finditer(text))
     characters = len(text)
     reading_time = max(1, words // 200)  # Average reading speed: 200 words/minute
     
@@ -30,9 +72,9 @@ def calculate_metadata(content: str) -> dict:
 # Note CRUD
 def create_note(db: Session, note: NoteCreate, user_id: UUID) -> Note:
     """Create a new note."""
-    metadata = calculate_metadata(note.content)
+    metadata = calculate_metadata(note.content, note.content_type)
     
-    db_note = Note(
+    stmt = insert(Note).values(
         user_id=user_id,
         title=note.title,
         content=note.content,
@@ -41,10 +83,9 @@ def create_note(db: Session, note: NoteCreate, user_id: UUID) -> Note:
         tags=note.tags,
         is_pinned=note.is_pinned,
         **metadata,
-    )
-    db.add(db_note)
+    ).returning(Note)
+    db_note = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(db_note)
     return db_note
 
 
@@ -67,18 +108,21 @@ def get_notes(
     is_pinned: Optional[bool] = None,
     is_archived: Optional[bool] = None,
     is_favorite: Optional[bool] = None,
-) -> tuple[List[Note], int]:
-    """Get notes with filters and pagination."""
-    query = db.query(Note).filter(Note.user_id == user_id)
+) -> tuple[list, int]:
+    """
+    Get notes with filters and pagination.
+    
+    Returns rows of NOTE_LIST_COLUMNS rather than Note objects, so note
+    bodies never leave the database.
+    """
+    # Categories come back in the same SELECT through the outer join
+    query = db.query(*NOTE_LIST_COLUMNS).outerjoin(_ListCategory, Note.category)
+    query = query.filter(Note.user_id == user_id)
     
     # Apply filters
     if search:
-        search_pattern = f"%{search}%"
         query = query.filter(
-            or_(
-                Note.title.ilike(search_pattern),
-                Note.content.ilike(search_pattern)
-            )
+            Note.search_vector.op('@@')(func.plainto_tsquery('english', search))
         )
     
     if category_id:
@@ -97,36 +141,51 @@ def get_notes(
     if is_favorite is not None:
         query = query.filter(Note.is_favorite == is_favorite)
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination and sorting
-    notes = query.options(joinedload(Note.category)).order_by(
+    # Apply pagination and sorting; the total rides along as a window count
+    rows = query.add_columns(func.count().over().label("total")).order_by(
         Note.is_pinned.desc(),
         Note.updated_at.desc()
     ).offset(skip).limit(limit).all()
     
-    return notes, total
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Page past the end returns no rows to read the total from
+        total = query.count()
+    else:
+        total = 0
+    
+    return rows, total
 
 
 def update_note(db: Session, note_id: UUID, note_update: NoteUpdate, user_id: UUID) -> Optional[Note]:
-    """Update a note."""
-    db_note = get_note(db, note_id, user_id)
-    if not db_note:
-        return None
-    
+    """Update a note with a single UPDATE ... RETURNING scoped to the owner."""
     update_data = note_update.dict(exclude_unset=True)
+    if not update_data:
+        return get_note(db, note_id, user_id)
     
     # Recalculate metadata if content changed
     if "content" in update_data:
-        metadata = calculate_metadata(update_data["content"])
+        content_type = update_data.get("content_type")
+        if content_type is None:
+            content_type = db.query(Note.content_type).filter(
+                Note.id == note_id,
+                Note.user_id == user_id
+            ).scalar()
+            if content_type is None:
+                return None
+        metadata = calculate_metadata(update_data["content"], content_type)
         update_data.update(metadata)
     
-    for field, value in update_data.items():
-        setattr(db_note, field, value)
-    
+    stmt = (
+        update(Note)
+        .where(Note.id == note_id, Note.user_id == user_id)
+        .values(**update_data)
+        .returning(Note)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    db_note = db.execute(stmt).scalar_one_or_none()
     db.commit()
-    db.refresh(db_note)
     return db_note
 
 
@@ -141,20 +200,40 @@ def delete_note(db: Session, note_id: UUID, user_id: UUID) -> bool:
     return True
 
 
+# Boolean note flags that can be toggled in place
+TOGGLE_FLAGS = frozenset({"is_pinned", "is_favorite", "is_archived"})
+
+
+def toggle_flag(db: Session, note_id: UUID, user_id: UUID, field: str) -> Optional[Note]:
+    """Flip a boolean flag on a note with a single UPDATE ... RETURNING."""
+    if field not in TOGGLE_FLAGS:
+        raise ValueError(f"Unknown note flag: {field}")
+    
+    column = getattr(Note, field)
+    stmt = (
+        update(Note)
+        .where(Note.id == note_id, Note.user_id == user_id)
+        .values({field: ~column})
+        .returning(Note)
+        .execution_options(synchronize_session=False)
+    )
+    db_note = db.execute(stmt).scalar_one_or_none()
+    db.commit()
+    return db_note
+
+
 def get_all_tags(db: Session, user_id: UUID) -> List[str]:
     """Get all unique tags for a user."""
-    notes = db.query(Note.tags).filter(
+    # Flatten and deduplicate in the database rather than shipping every tags array
+    tag = func.jsonb_array_elements_text(Note.tags).label("tag")
+    # Untagged notes hold the JSON null scalar (not SQL NULL), which
+    # jsonb_array_elements_text rejects; only expand real arrays
+    rows = db.query(tag).filter(
         Note.user_id == user_id,
-        Note.tags.isnot(None)
-    ).all()
-    
-    # Flatten and deduplicate tags
-    all_tags = set()
-    for note in notes:
-        if note.tags:
-            all_tags.update(note.tags)
+        func.jsonb_typeof(Note.tags) == 'array'
+    ).distinct().order_by(tag).all()
     
-    return sorted(list(all_tags))
+    return [row.tag for row in rows]
 
 
 # Category CRUD
@@ -1,9 +1,9 @@
 """
 Notes module models.
 """
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Boolean, Integer, DateTime, ForeignKey, Text, Index, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from datetime import datetime
 import enum
@@ -58,12 +58,12 @@ class Note(Base):
     
     # Organization
     category_id = Column(UUID(as_uuid=True), ForeignKey("note_categories.id", ondelete="SET NULL"), nullable=True, index=True)
-    tags = Column(JSON, nullable=True)  # Array of strings
+    tags = Column(JSONB, nullable=True)  # Array of strings
     
     # Status
-    is_pinned = Column(Boolean, default=False, nullable=False, index=True)
-    is_archived = Column(Boolean, default=False, nullable=False, index=True)
-    is_favorite = Column(Boolean, default=False, nullable=False, index=True)
+    is_pinned = Column(Boolean, default=False, nullable=False)
+    is_archived = Column(Boolean, default=False, nullable=False)
+    is_favorite = Column(Boolean, default=False, nullable=False)
     
     # Sharing
     is_shared = Column(Boolean, default=False, nullable=False)
@@ -74,6 +74,12 @@ class Note(Base):
     character_count = Column(Integer, default=0, nullable=False)
     reading_time_minutes = Column(Integer, default=0, nullable=False)
     
+    # Full-text search, maintained by Postgres; deferred so it is never loaded
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))", persisted=True),
+    ))
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
@@ -83,6 +89,17 @@ class Note(Base):
     user = relationship("User", back_populates="notes")
     category = relationship("NoteCategory", back_populates="notes")
     versions = relationship("NoteVersion", back_populates="note", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Serves tag containment filters (tags @> '["x"]'); jsonb_path_ops only
+        # supports @>, which is all we use, and is smaller and faster than the default
+        Index('ix_notes_tags_gin', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
+        # Matches the list ordering (is_pinned DESC, updated_at DESC) per user
+        Index('ix_notes_user_listing', 'user_id', 'is_pinned', 'updated_at'),
+        Index('ix_notes_user_archived', 'user_id', 'updated_at', postgresql_where=text('is_archived = false')),
+        Index('ix_notes_user_favorite', 'user_id', postgresql_where=text('is_favorite = true')),
+        Index('ix_notes_search_gin', 'search_vector', postgresql_using='gin'),
+    )
 
 
 class NoteVersion(Base):
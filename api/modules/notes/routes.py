@@ -2,17 +2,24 @@
 Notes module API routes.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from api.config import settings
 from api.database import get_db
+from api.core.schemas import orm_to_response
 from api.core.dependencies import get_current_user, require_permissions
 from api.core.models import User
 from api.modules.notes import crud, schemas
 from api.modules.notes.models import Note, NoteCategory
 
-router = APIRouter(prefix="/notes", tags=["notes"])
+router = APIRouter(prefix="/notes", tags=["notes"], default_response_class=ORJSONResponse)
+
+# Validators for list responses, built once at import
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[schemas.NoteCategoryResponse])
 
 
 # Category endpoints
@@ -32,7 +39,11 @@ def list_categories(
     db: Session = Depends(get_db),
 ):
     """List all categories."""
-    return crud.get_categories(db, current_user.id)
+    categories = crud.get_categories(db, current_user.id)
+    # Validated once here; returning a response skips response_model re-validation
+    return ORJSONResponse(CATEGORY_LIST_ADAPTER.dump_python(
+        CATEGORY_LIST_ADAPTER.validate_python(categories, from_attributes=True), mode="json"
+    ))
 
 
 @router.get("/categories/{category_id}", response_model=schemas.NoteCategoryResponse)
@@ -114,29 +125,33 @@ def list_notes(
         is_favorite=is_favorite,
     )
     
-    # Convert to list response (with content preview)
+    # Convert to list response; the preview is already stripped by the database
     items = []
-    for note in notes:
-        # Create preview (first 150 chars of content without HTML)
-        import re
-        text = re.sub(r'<[^>]+>', '', note.content)
-        preview = text[:150] + "..." if len(text) > 150 else text
-        
-        item_dict = {
-            **note.__dict__,
-            "content_preview": preview,
-        }
-        items.append(schemas.NoteListResponse(**item_dict))
+    for row in notes:
+        item_dict = dict(row._mapping)
+        preview = item_dict["content_preview"] or ""
+        if len(preview) > crud.PREVIEW_LENGTH:
+            preview = preview[:crud.PREVIEW_LENGTH] + "..."
+        item_dict["content_preview"] = preview
+        if settings.TRUST_DB:
+            # Projected straight from our own columns; skip re-validation
+            if item_dict["category"] is not None:
+                item_dict["category"] = orm_to_response(item_dict["category"], schemas.NoteCategoryResponse)
+            items.append(schemas.NoteListResponse.model_construct(**item_dict))
+        else:
+            items.append(schemas.NoteListResponse.model_validate(item_dict, from_attributes=True))
     
     pages = (total + size - 1) // size
     
-    return schemas.PaginatedNotesResponse(
+    # Items are already built; serialize them directly instead of letting
+    # response_model validate the whole page again
+    return ORJSONResponse(schemas.PaginatedNotesResponse.model_construct(
         items=items,
         total=total,
         page=page,
         size=size,
         pages=pages,
-    )
+    ).model_dump(mode="json"))
 
 
 @router.get("/{note_id}", response_model=schemas.NoteResponse)
@@ -186,13 +201,9 @@ def toggle_pin(
     db: Session = Depends(get_db),
 ):
     """Toggle note pin status."""
-    note = crud.get_note(db, note_id, current_user.id)
+    note = crud.toggle_flag(db, note_id, current_user.id, "is_pinned")
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    
-    note.is_pinned = not note.is_pinned
-    db.commit()
-    db.refresh(note)
     return note
 
 
@@ -203,13 +214,9 @@ def toggle_favorite(
     db: Session = Depends(get_db),
 ):
     """Toggle note favorite status."""
-    note = crud.get_note(db, note_id, current_user.id)
+    note = crud.toggle_flag(db, note_id, current_user.id, "is_favorite")
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    
-    note.is_favorite = not note.is_favorite
-    db.commit()
-    db.refresh(note)
     return note
 
 
@@ -220,13 +227,9 @@ def toggle_archive(
     db: Session = Depends(get_db),
 ):
     """Toggle note archive status."""
-    note = crud.get_note(db, note_id, current_user.id)
+    note = crud.toggle_flag(db, note_id, current_user.id, "is_archived")
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    
-    note.is_archived = not note.is_archived
-    db.commit()
-    db.refresh(note)
     return note
 
 
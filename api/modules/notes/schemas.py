@@ -6,6 +6,8 @@ from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 
+from api.core.schemas import warm_schemas
+
 
 class NoteCategoryCreate(BaseModel):
     """Schema for creating a note category."""
@@ -52,8 +54,8 @@ class NoteCreate(BaseModel):
     @validator("tags")
     def validate_tags(cls, v):
         if v is not None:
-            # Remove duplicates and empty strings
-            return list(set(filter(None, v)))
+            # Remove duplicates and empty strings, keeping first-seen order
+            return list(dict.fromkeys(t for t in v if t))
         return v
 
 
@@ -71,7 +73,7 @@ class NoteUpdate(BaseModel):
     @validator("tags")
     def validate_tags(cls, v):
         if v is not None:
-            return list(set(filter(None, v)))
+            return list(dict.fromkeys(t for t in v if t))
         return v
 
 
@@ -98,6 +100,7 @@ class NoteResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True  # Never modified once built
 
 
 class NoteListResponse(BaseModel):
@@ -117,6 +120,7 @@ class NoteListResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True  # Never modified once built
 
 
 class NoteVersionResponse(BaseModel):
@@ -140,3 +144,12 @@ class PaginatedNotesResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+warm_schemas(
+    NoteCategoryResponse,
+    NoteResponse,
+    NoteListResponse,
+    NoteVersionResponse,
+    PaginatedNotesResponse,
+)
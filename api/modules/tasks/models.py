@@ -1,12 +1,11 @@
 """
 Database models for Tasks module.
 """
-from datetime import datetime
 from typing import Optional
 import uuid
 import enum
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Enum as SQLEnum, Index, JSON
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, CheckConstraint, Index, JSON, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -40,9 +39,9 @@ class Task(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     
-    # Status and priority
-    status = Column(SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True)
-    priority = Column(SQLEnum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False, index=True)
+    # Status and priority; stored as the enum values, checked by the database
+    status = Column(String(16), default=TaskStatus.TODO.value, nullable=False, index=True)
+    priority = Column(String(16), default=TaskPriority.MEDIUM.value, nullable=False, index=True)
     
     # Dates
     due_date = Column(DateTime, nullable=True, index=True)
@@ -60,16 +59,25 @@ class Task(Base):
     # Sharing
     is_shared = Column(Boolean, default=False, index=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps, set by the database
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="tasks")
     
     __table_args__ = (
-        Index('ix_tasks_user_status', 'user_id', 'status'),
-        Index('ix_tasks_user_priority', 'user_id', 'priority'),
+        CheckConstraint("status IN ('todo', 'in_progress', 'completed', 'cancelled')", name='status'),
+        CheckConstraint("priority IN ('low', 'medium', 'high', 'urgent')", name='priority'),
+        # Task lists, newest first; also serves keyset pagination on (created_at, id)
+        Index('ix_tasks_user_created', 'user_id', 'created_at', 'id'),
+        Index('ix_tasks_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_tasks_user_priority_created', 'user_id', 'priority', 'created_at'),
+        # Pending tasks with deadlines, scanned by the deadline notifier
+        Index(
+            'ix_tasks_user_due_pending', 'user_id', 'due_date',
+            postgresql_where=text("status NOT IN ('completed', 'cancelled') AND due_date IS NOT NULL"),
+        ),
     )
     
     def __repr__(self):
@@ -1,19 +1,77 @@
 """
 API routes for Tasks module.
 """
+import base64
+import binascii
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, func, insert, lambda_stmt, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from api.database import get_db
+from api.config import settings
+from api.database import get_async_db
 from api.core import models as core_models
+from api.core.schemas import to_dict
 from api.core.dependencies import get_current_active_user, require_permissions
 from api.modules.tasks import models, schemas
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Validators for list responses, built once at import
+TASK_LIST_ADAPTER = TypeAdapter(List[schemas.TaskResponse])
+
+# TaskResponse fields holding UUIDs (all non-nullable)
+TASK_UUID_FIELDS = ("id", "user_id")
+
+# Single-task lookup; the lambda is analyzed once and its SQL reused per request
+TASK_BY_ID_STMT = lambda_stmt(
+    lambda: select(models.Task).where(
+        models.Task.id == bindparam("task_id"),
+        models.Task.user_id == bindparam("user_id"),
+    )
+)
+
+
+def task_body(task: models.Task) -> dict:
+    """
+    Build a TaskResponse body from a task row.
+    
+    Rows from our own database are trusted (settings.TRUST_DB), so their
+    columns go straight to orjson without a validation round trip. The
+    asyncpg driver returns its own UUID type, which orjson cannot encode,
+    so UUID columns are converted to strings.
+    """
+    if settings.TRUST_DB:
+        body = to_dict(task, schemas.TaskResponse)
+        for field in TASK_UUID_FIELDS:
+            body[field] = str(body[field])
+        return body
+    return schemas.TaskResponse.model_validate(task).model_dump(mode="json")
+
+
+def task_response(task: models.Task, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Return a task as a JSON response, bypassing response_model validation."""
+    return ORJSONResponse(task_body(task), status_code=status_code)
+
+
+def encode_cursor(task: models.Task) -> str:
+    """Encode a task's (created_at, id) position as an opaque cursor."""
+    raw = f"{task.created_at.isoformat()}|{task.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor into (created_at, id)."""
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.get("/", response_model=schemas.TaskListResponse)
@@ -22,8 +80,9 @@ async def list_tasks(
     priority: Optional[schemas.TaskPriorityEnum] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: core_models.User = Depends(require_permissions("tasks.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List tasks for the current user.
@@ -32,35 +91,75 @@ async def list_tasks(
     - **priority**: Filter by priority (optional)
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 20, max: 100)
+    - **cursor**: `next_cursor` from the previous page (optional, preferred over
+      `page`; seeks directly to the next page and skips the total count)
     """
-    query = db.query(models.Task).filter(models.Task.user_id == current_user.id)
+    filters = [models.Task.user_id == current_user.id]
     
     # Apply filters
     if status:
-        query = query.filter(models.Task.status == status)
+        filters.append(models.Task.status == status.value)
     if priority:
-        query = query.filter(models.Task.priority == priority)
+        filters.append(models.Task.priority == priority.value)
+    
+    ordering = (models.Task.created_at.desc(), models.Task.id.desc())
     
-    # Get total count
-    total = query.count()
+    if cursor:
+        # Keyset pagination: seek past the cursor instead of counting and offsetting
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        result = await db.execute(
+            select(models.Task)
+            .where(
+                *filters,
+                tuple_(models.Task.created_at, models.Task.id) < tuple_(cursor_created_at, cursor_id),
+            )
+            .order_by(*ordering)
+            .limit(page_size)
+        )
+        tasks = result.scalars().all()
+        total = None
+    else:
+        # Apply pagination; the total rides along as a window count
+        skip = (page - 1) * page_size
+        result = await db.execute(
+            select(models.Task, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(*ordering)
+            .offset(skip)
+            .limit(page_size)
+        )
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Page past the end returns no rows to read the total from
+            total = await db.scalar(select(func.count()).select_from(models.Task).where(*filters))
+        else:
+            total = 0
+        tasks = [row[0] for row in rows]
     
-    # Apply pagination
-    skip = (page - 1) * page_size
-    tasks = query.order_by(models.Task.created_at.desc()).offset(skip).limit(page_size).all()
+    if settings.TRUST_DB:
+        items = [task_body(task) for task in tasks]
+    else:
+        items = TASK_LIST_ADAPTER.dump_python(
+            TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True), mode="json"
+        )
     
-    return schemas.TaskListResponse(
-        items=tasks,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return ORJSONResponse({
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": encode_cursor(tasks[-1]) if len(tasks) == page_size else None,
+    })
 
 
 @router.post("/", response_model=schemas.TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_create: schemas.TaskCreate,
     current_user: core_models.User = Depends(require_permissions("tasks.create")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new task.
@@ -77,23 +176,45 @@ async def create_task(
     )
     
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     
-    return task
+    return task_response(task, status.HTTP_201_CREATED)
+
+
+@router.post("/bulk", response_model=List[schemas.TaskResponse], status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(
+    bulk_create: schemas.TaskBulkCreate,
+    current_user: core_models.User = Depends(require_permissions("tasks.create")),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create up to 100 tasks in one request.
+    
+    All tasks are inserted with a single multi-row INSERT ... RETURNING
+    and come back in the order they were sent.
+    """
+    result = await db.execute(
+        insert(models.Task).returning(models.Task, sort_by_parameter_order=True),
+        [dict(user_id=current_user.id, **task_create.model_dump()) for task_create in bulk_create.tasks],
+    )
+    tasks = result.scalars().all()
+    await db.commit()
+    
+    return ORJSONResponse([task_body(task) for task in tasks], status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{task_id}", response_model=schemas.TaskResponse)
 async def get_task(
     task_id: UUID,
     current_user: core_models.User = Depends(require_permissions("tasks.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific task by ID."""
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        TASK_BY_ID_STMT, {"task_id": task_id, "user_id": current_user.id}
+    )
+    task = result.scalar_one_or_none()
     
     if not task:
         raise HTTPException(
@@ -101,7 +222,7 @@ async def get_task(
             detail="Task not found"
         )
     
-    return task
+    return task_response(task)
 
 
 @router.put("/{task_id}", response_model=schemas.TaskResponse)
@@ -109,13 +230,26 @@ async def update_task(
     task_id: UUID,
     task_update: schemas.TaskUpdate,
     current_user: core_models.User = Depends(require_permissions("tasks.edit")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a task."""
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    update_data = task_update.model_dump(exclude_unset=True)
+    
+    # If status changed to completed, set completed_at (keeping an earlier one)
+    if task_update.status == schemas.TaskStatusEnum.COMPLETED:
+        update_data["completed_at"] = func.coalesce(models.Task.completed_at, func.now())
+    elif task_update.status:
+        update_data["completed_at"] = None
+    
+    # One round trip: ownership check, update and reload
+    result = await db.execute(
+        update(models.Task)
+        .where(models.Task.id == task_id, models.Task.user_id == current_user.id)
+        .values(**update_data)
+        .returning(models.Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalar_one_or_none()
     
     if not task:
         raise HTTPException(
@@ -123,44 +257,33 @@ async def update_task(
             detail="Task not found"
         )
     
-    # Update fields
-    update_data = task_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-    
-    # If status changed to completed, set completed_at
-    if task_update.status == schemas.TaskStatusEnum.COMPLETED and not task.completed_at:
-        task.completed_at = datetime.utcnow()
-    elif task_update.status and task_update.status != schemas.TaskStatusEnum.COMPLETED:
-        task.completed_at = None
+    await db.commit()
     
-    task.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(task)
-    
-    return task
+    return task_response(task)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: UUID,
     current_user: core_models.User = Depends(require_permissions("tasks.delete")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a task."""
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        delete(models.Task)
+        .where(models.Task.id == task_id, models.Task.user_id == current_user.id)
+        .returning(models.Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id = result.scalar_one_or_none()
     
-    if not task:
+    if not deleted_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    db.delete(task)
-    db.commit()
+    await db.commit()
     
     return None
 
@@ -169,13 +292,17 @@ async def delete_task(
 async def complete_task(
     task_id: UUID,
     current_user: core_models.User = Depends(require_permissions("tasks.edit")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a task as completed."""
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        update(models.Task)
+        .where(models.Task.id == task_id, models.Task.user_id == current_user.id)
+        .values(status=models.TaskStatus.COMPLETED.value, completed_at=func.now())
+        .returning(models.Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalar_one_or_none()
     
     if not task:
         raise HTTPException(
@@ -183,11 +310,6 @@ async def complete_task(
             detail="Task not found"
         )
     
-    task.status = models.TaskStatus.COMPLETED
-    task.completed_at = datetime.utcnow()
-    task.updated_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     
-    return task
+    return task_response(task)
@@ -3,9 +3,11 @@ Pydantic schemas for Tasks module.
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field, UUID4, ConfigDict
+from pydantic import BaseModel, Field, UUID4, ConfigDict, field_validator
 from enum import Enum
 
+from api.core.schemas import warm_schemas
+
 
 class TaskPriorityEnum(str, Enum):
     """Task priority levels."""
@@ -25,11 +27,21 @@ class TaskStatusEnum(str, Enum):
 
 class TaskBase(BaseModel):
     """Base task schema."""
+    model_config = ConfigDict(use_enum_values=True)
+    
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
-    priority: TaskPriorityEnum = TaskPriorityEnum.MEDIUM
+    priority: TaskPriorityEnum = TaskPriorityEnum.MEDIUM.value
     due_date: Optional[datetime] = None
     tags: Optional[List[str]] = None
+    
+    @field_validator("tags")
+    @classmethod
+    def validate_tags(cls, v):
+        if v is not None:
+            # Remove duplicates and empty strings, keeping first-seen order
+            return list(dict.fromkeys(t for t in v if t))
+        return v
 
 
 class TaskCreate(TaskBase):
@@ -37,14 +49,28 @@ class TaskCreate(TaskBase):
     pass
 
 
+class TaskBulkCreate(BaseModel):
+    """Schema for creating several tasks at once."""
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=100)
+
+
 class TaskUpdate(BaseModel):
     """Schema for updating a task."""
+    model_config = ConfigDict(use_enum_values=True)
+    
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     status: Optional[TaskStatusEnum] = None
     priority: Optional[TaskPriorityEnum] = None
     due_date: Optional[datetime] = None
     tags: Optional[List[str]] = None
+    
+    @field_validator("tags")
+    @classmethod
+    def validate_tags(cls, v):
+        if v is not None:
+            return list(dict.fromkeys(t for t in v if t))
+        return v
 
 
 class TaskResponse(TaskBase):
@@ -57,12 +83,20 @@ class TaskResponse(TaskBase):
     created_at: datetime
     updated_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    # Responses are never modified once built
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, frozen=True)
 
 
 class TaskListResponse(BaseModel):
     """Schema for paginated task list response."""
     items: List[TaskResponse]
-    total: int
+    total: Optional[int]  # None when paginating by cursor
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+warm_schemas(
+    TaskResponse,
+    TaskListResponse,
+)
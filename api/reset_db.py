@@ -1,3 +1,5 @@
+from sqlalchemy import text
+
 from api.database import Base, engine, SessionLocal
 from api.core import models  # Import models to ensure they are registered
 from api.core.init_data import init_default_data
@@ -6,10 +8,16 @@ def reset_database():
     print("⚠️  Resetting database...")
     
     print("  🗑️  Dropping all tables...")
-    Base.metadata.drop_all(bind=engine)
+    if engine.dialect.name == "postgresql":
+        # One statement drops every table, type and sequence at once
+        with engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA public CASCADE; CREATE SCHEMA public;"))
+    else:
+        Base.metadata.drop_all(bind=engine)
     
     print("  ✨ Creating all tables...")
-    Base.metadata.create_all(bind=engine)
+    # The schema is empty at this point, so skip the existence checks
+    Base.metadata.create_all(bind=engine, checkfirst=False)
     
     print("  📝 Initializing default data...")
     db = SessionLocal()
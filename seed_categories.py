@@ -78,17 +78,26 @@ async def seed_categories():
             print(f"Found {len(existing_categories)} existing categories.")
             existing_names = {c["name"] for c in existing_categories}
 
-            # 3. Create missing categories
+            # 3. Create missing categories, all at once
+            missing = []
             for cat in DEFAULT_CATEGORIES:
                 if cat["name"] in existing_names:
                     print(f"Category '{cat['name']}' already exists. Skipping.")
                 else:
                     print(f"Creating category '{cat['name']}'...")
-                    response = await client.post(CATEGORIES_URL, json=cat, headers=headers)
-                    if response.status_code == 201:
-                        print(f"  ✅ Created '{cat['name']}'")
-                    else:
-                        print(f"  ❌ Failed to create '{cat['name']}': {response.text}")
+                    missing.append(cat)
+            
+            results = await asyncio.gather(
+                *[client.post(CATEGORIES_URL, json=cat, headers=headers) for cat in missing],
+                return_exceptions=True,
+            )
+            for cat, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    print(f"  ❌ Failed to create '{cat['name']}': {result}")
+                elif result.status_code == 201:
+                    print(f"  ✅ Created '{cat['name']}'")
+                else:
+                    print(f"  ❌ Failed to create '{cat['name']}': {result.text}")
 
             print("\n✨ Category seeding completed!")
 
@@ -0,0 +1,74 @@
+import httpx
+import time
+
+API_URL = "http://localhost:8000"
+LOGIN_URL = f"{API_URL}/api/v1/auth/login"
+TASKS_URL = f"{API_URL}/api/v1/tasks/"
+
+def check(response, expected_status, label):
+    if response.status_code == expected_status:
+        print(f"✅ {label}")
+        return True
+    print(f"❌ {label} failed: {response.status_code}")
+    print(response.text)
+    return False
+
+def test_task_endpoints():
+    # Run against a server with default settings (TRUST_DB on, tasks on the
+    # asyncpg session) so trusted rows go through the orjson fast path
+    with httpx.Client() as client:
+        # 0. Register
+        print("Registering user...")
+        email = f"tasks_{int(time.time())}@example.com"
+        register_data = {
+            "email": email,
+            "password": "taskspassword123",
+            "full_name": "Tasks User"
+        }
+        response = client.post(f"{API_URL}/api/v1/auth/register", json=register_data)
+        if not check(response, 201, "Registration"):
+            return False
+
+        # 1. Login
+        print("Logging in...")
+        response = client.post(LOGIN_URL, json={"email": email, "password": "taskspassword123"})
+        if not check(response, 200, "Login"):
+            return False
+        token = response.json()["token"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        ok = True
+
+        # 2. Create a task
+        response = client.post(TASKS_URL, json={"title": "Test Task", "tags": ["api"]}, headers=headers)
+        ok &= check(response, 201, "Create task")
+        task_id = response.json()["id"] if response.status_code == 201 else None
+
+        # 3. Bulk create
+        bulk_data = {"tasks": [{"title": f"Bulk Task {i}"} for i in range(3)]}
+        response = client.post(f"{TASKS_URL}bulk", json=bulk_data, headers=headers)
+        ok &= check(response, 201, "Bulk create tasks")
+
+        # 4. List, then follow the cursor
+        response = client.get(TASKS_URL, params={"page_size": 2}, headers=headers)
+        ok &= check(response, 200, "List tasks")
+        next_cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        if next_cursor:
+            response = client.get(TASKS_URL, params={"page_size": 2, "cursor": next_cursor}, headers=headers)
+            ok &= check(response, 200, "List tasks by cursor")
+
+        if task_id:
+            # 5. Get, update and complete the first task
+            response = client.get(f"{TASKS_URL}{task_id}", headers=headers)
+            ok &= check(response, 200, "Get task")
+
+            response = client.put(f"{TASKS_URL}{task_id}", json={"priority": "high"}, headers=headers)
+            ok &= check(response, 200, "Update task")
+
+            response = client.post(f"{TASKS_URL}{task_id}/complete", headers=headers)
+            ok &= check(response, 200, "Complete task")
+
+        return ok
+
+if __name__ == "__main__":
+    test_task_endpoints()
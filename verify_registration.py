@@ -21,7 +21,8 @@ def test_register():
     
     print(f"Registering user: {email}")
     try:
-        response = requests.post(f"{BASE_URL}/register", json=payload)
+        with requests.Session() as session:
+            response = session.post(f"{BASE_URL}/register", json=payload)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         